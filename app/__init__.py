@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from flask import Flask, send_from_directory
 from .config import Config
-from .extensions import db, migrate, bcrypt
+from .extensions import db, migrate, bcrypt, session_cache, limiter
 from dotenv import load_dotenv
 from whitenoise import WhiteNoise
 
@@ -21,10 +21,11 @@ class RequestContextFilter(logging.Filter):
     def filter(self, record):
         try:
             from flask import g, request
+            from .utils.proxy import client_ip
             record.request_id = getattr(g, 'request_id', '-')
             record.method = getattr(request, 'method', '-')
             record.path = getattr(request, 'path', '-')
-            record.remote_addr = request.headers.get('X-Forwarded-For', request.remote_addr)
+            record.remote_addr = client_ip()
         except Exception:
             record.request_id = '-'
             record.method = '-'
@@ -124,22 +125,22 @@ def create_app(config_class=Config):
         if getattr(g, 'request_id', None):
             response.headers['X-Request-ID'] = g.request_id
 
-        # Best-effort user id
+        # Best-effort user id; only reported if the request already resolved it
         user_id = None
         try:
-            from .utils.auth import get_current_user
-            user = get_current_user()
-            user_id = getattr(user, 'id', None)
+            from .utils.auth import peek_current_user
+            user_id = getattr(peek_current_user(), 'id', None)
         except Exception:
             user_id = None
+        auth_resolutions = getattr(g, 'auth_resolutions', 0)
 
         # Only log non-static requests and slow/error requests
         if not request.path.startswith('/static/'):
             if duration_ms and (duration_ms > 100 or response.status_code >= 400):
                 app.logger.info(
-                    "req=%s %s %s end status=%s duration_ms=%.1f user_id=%s",
+                    "req=%s %s %s end status=%s duration_ms=%.1f user_id=%s auth_resolutions=%s",
                     getattr(g, 'request_id', '-'), request.method, request.path,
-                    response.status_code, duration_ms, user_id
+                    response.status_code, duration_ms, user_id, auth_resolutions
                 )
         return response
     
@@ -167,6 +168,15 @@ def create_app(config_class=Config):
     db.init_app(app)
     migrate.init_app(app, db)
     bcrypt.init_app(app)
+    session_cache.init_app(app)
+    limiter.init_app(app)
+    from .utils.passwords import PasswordPoolBusy, pool_busy_response
+    app.register_error_handler(PasswordPoolBusy, pool_busy_response)
+    if app.config.get('BCRYPT_CALIBRATE_MS'):
+        from .utils.passwords import calibrate_cost
+        cost, base_ms = calibrate_cost(target_ms=app.config['BCRYPT_CALIBRATE_MS'])
+        app.config['BCRYPT_LOG_ROUNDS'] = cost
+        app.logger.info("startup.bcrypt_calibrated cost=%s base_ms=%.1f", cost, base_ms)
     
     # Store startup time for diagnostics
     app.config['STARTUP_TIME'] = datetime.utcnow().isoformat()
@@ -199,6 +209,12 @@ def create_app(config_class=Config):
             app.logger.info('startup.db_tables tables=%s', insp.get_table_names())
         except Exception as e:
             app.logger.exception("startup.db_create_all failed: %s", e)
+        try:
+            from .jobs.search import ensure_search_index
+            ensure_search_index(app)
+        except Exception as e:
+            db.session.rollback()
+            app.logger.exception("startup.search_index failed: %s", e)
 
     # Register blueprints
     from .auth import bp as auth_bp
@@ -219,6 +235,34 @@ def create_app(config_class=Config):
     from .notifications import bp as notifications_bp
     app.register_blueprint(notifications_bp)
 
+    from .jobs.facets import facet_cache
+    facet_cache.init_app(app)
+
+    from .jobs.ranking import dashboard_cache
+    dashboard_cache.init_app(app)
+
+    from .notifications.unread import unread_cache
+    unread_cache.init_app(app)
+
+    from .notifications.hub import notification_hub
+    notification_hub.init_app(app)
+
+    from .utils.fragments import init_app as init_fragments
+    init_fragments(app)
+
+    # Optional periodic cleanup of expired tokens
+    from .utils.background import start_periodic
+    from .utils.token_reaper import reap_expired_tokens
+    start_periodic(app, 'token_reaper', app.config.get('TOKEN_REAPER_INTERVAL'),
+                   lambda: reap_expired_tokens(batch_size=app.config.get('TOKEN_REAPER_BATCH_SIZE', 500)))
+    # Optional periodic archiving of jobs past their deadline
+    from .jobs.expiry import expire_overdue_jobs
+    start_periodic(app, 'deadline_sweep', app.config.get('DEADLINE_SWEEP_INTERVAL'),
+                   lambda: expire_overdue_jobs(batch_size=app.config.get('DEADLINE_SWEEP_BATCH_SIZE', 500)))
+    from .jobs.similar import available as similar_available, rebuild_similarity_index
+    if similar_available():
+        start_periodic(app, 'similar_jobs', app.config.get('SIMILAR_JOBS_REFRESH'), rebuild_similarity_index)
+
     @app.route('/')
     def index():
         from flask import redirect, url_for
@@ -235,7 +279,9 @@ def create_app(config_class=Config):
         from .utils.auth import get_current_user
         # detect mobile user-agent roughly and provide flags for templates
         from flask import request
-        cu = get_current_user()
+        from werkzeug.local import LocalProxy
+        # Lazy: the user is only resolved if a template actually touches it
+        cu = LocalProxy(get_current_user)
         ua = request.user_agent.string or ''
         is_mobile = False
         try:
@@ -244,7 +290,11 @@ def create_app(config_class=Config):
                 is_mobile = True
         except Exception:
             is_mobile = False
-        is_admin = bool(cu and getattr(cu, 'role', None) == 'admin')
-        return dict(current_user=cu, is_mobile=is_mobile, is_admin=is_admin)
+        is_admin = LocalProxy(lambda: getattr(get_current_user(), 'role', None) == 'admin')
+        # Nav badge; served from the unread cache, so a hit costs no query
+        from .notifications.unread import unread_count
+        unread_notifications = LocalProxy(lambda: unread_count(get_current_user().id) if get_current_user() else 0)
+        return dict(current_user=cu, is_mobile=is_mobile, is_admin=is_admin,
+                    unread_notifications=unread_notifications)
 
     return app
\ No newline at end of file
@@ -1,23 +1,25 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, make_response, current_app
 from app.extensions import db
-from app.models import Job, User, Notification, Application
+from app.models import Job, User, Notification, Application, JobRating
 from app.models import Recommendation
-from app.forms import JobForm, EditJobForm, DeleteJobForm
+from app.forms import JobForm, EditJobForm, DeleteJobForm, ImportJobsForm
 from functools import wraps
 from datetime import datetime, timedelta
 import secrets
-from app.models.admin_token import AdminToken
+from app.utils.admin_tokens import issue_admin_token, verify_admin_token, revoke_admin_token
 from flask import jsonify
+from app.jobs.search import index_job, remove_job
+from app.jobs.similar import update_similarity
+from app.notifications.fanout import notify_applicants
+from app.notifications.broadcasts import broadcast
 
 
 def admin_token_required(f):
     @wraps(f)
     def wrapped(*args, **kwargs):
-        token = request.cookies.get('admin_token')
-        if token:
-            at = AdminToken.query.filter_by(token=token).first()
-            if at and at.expires_at >= datetime.utcnow():
-                return f(*args, **kwargs)
+        # Signed, self-contained token: no database round trip per page
+        if verify_admin_token(request.cookies.get('admin_token')):
+            return f(*args, **kwargs)
         # not authorized, redirect to login for Basic auth
         login_url = url_for('admin.login')
         return redirect(login_url)
@@ -25,11 +27,7 @@ def admin_token_required(f):
 
 
 def create_admin_token(response, minutes=30):
-    token = secrets.token_urlsafe(48)
-    expires = datetime.utcnow() + timedelta(minutes=minutes)
-    at = AdminToken(token=token, expires_at=expires)
-    db.session.add(at)
-    db.session.commit()
+    token = issue_admin_token(minutes=minutes)
     # set cookie
     secure = False
     try:
@@ -43,6 +41,23 @@ def create_admin_token(response, minutes=30):
     return response
 
 
+def _reindex(job_id, removed=False):
+    # Keep the search and similarity indexes in step with job writes; never fail the admin action
+    try:
+        if removed:
+            remove_job(job_id)
+        else:
+            index_job(job_id)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("search.index_failed job_id=%s", job_id)
+    try:
+        update_similarity(job_id)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("similar.update_failed job_id=%s", job_id)
+
+
 bp = Blueprint('admin', __name__)
 
 bp = Blueprint('admin', __name__)
@@ -50,14 +65,11 @@ bp = Blueprint('admin', __name__)
 
 @bp.route('/logout')
 def logout():
-    # clear cookie and remove token from DB if present
+    # clear cookie and record the token as revoked until it expires
     token = request.cookies.get('admin_token')
     if token:
         try:
-            at = AdminToken.query.filter_by(token=token).first()
-            if at:
-                db.session.delete(at)
-                db.session.commit()
+            revoke_admin_token(token)
         except Exception:
             db.session.rollback()
     resp = make_response(redirect(url_for('admin.login')))
@@ -73,6 +85,13 @@ def index():
     return render_template('admin/index.html', jobs=jobs, jobs_count=jobs_count, users_count=users_count, admin_root=True, admin_name='root')
 
 
+@bp.route('/cache-stats')
+@admin_token_required
+def cache_stats():
+    caches = current_app.extensions.get('caches', {})
+    return jsonify({name: cache.stats() for name, cache in caches.items()})
+
+
 @bp.route('/recommendations')
 @admin_token_required
 def recommendations():
@@ -122,16 +141,33 @@ def new_job():
         job = Job(**job_kwargs)
         db.session.add(job)
         db.session.commit()
-        # Notify all users
-        users = User.query.filter(User.role != 'admin').all()
-        for user in users:
-            notification = Notification(user_id=user.id, message=f'New job posted: {job.title} at {job.company}')
-            db.session.add(notification)
+        _reindex(job.id)
+        # Notify all users: one broadcast row, fanned out when each user reads it
+        broadcast(f'New job posted: {job.title} at {job.company}')
         db.session.commit()
         flash('Job created successfully')
         return redirect(url_for('admin.index'))
     return render_template('admin/new_job.html', form=form)
 
+@bp.route('/jobs/import', methods=['GET', 'POST'])
+@admin_token_required
+def import_jobs():
+    from app.jobs.importer import detect_format, import_jobs as run_import, open_upload
+    form = ImportJobsForm()
+    report = None
+    if form.validate_on_submit():
+        upload = form.file.data
+        fmt = detect_format(upload.filename)
+        admin_user = User.query.filter_by(role='admin').first()
+        if admin_user is None:
+            flash('No admin user exists to own the imported jobs')
+        else:
+            report = run_import(open_upload(upload), fmt, admin_user.id,
+                                notify=form.notify.data, dry_run=form.dry_run.data)
+            flash(f"Imported {report['inserted']} of {report['rows']} rows"
+                  + (' (dry run)' if form.dry_run.data else ''))
+    return render_template('admin/import_jobs.html', form=form, report=report)
+
 @bp.route('/job/<int:job_id>/edit', methods=['GET', 'POST'])
 @admin_token_required
 def edit_job(job_id):
@@ -168,26 +204,19 @@ def edit_job(job_id):
         if hasattr(job, 'updated_at'):
             job.updated_at = datetime.utcnow()
         
-        db.session.commit()
-        
-        # If critical fields changed, notify all applicants
+        # If critical fields changed, notify all applicants in the same transaction
         if critical_changed:
-            applications = Application.query.filter_by(job_id=job_id).all()
-            for app in applications:
-                user = User.query.get(app.user_id)
-                if user:
-                    changes = []
-                    if old_title != job.title:
-                        changes.append(f"Title: {old_title} → {job.title}")
-                    if old_company != job.company:
-                        changes.append(f"Company: {old_company} → {job.company}")
-                    if old_deadline != job.deadline:
-                        changes.append(f"Deadline updated")
-                    
-                    message = f'Job "{job.title}" has been updated: ' + ', '.join(changes)
-                    notification = Notification(user_id=user.id, message=message)
-                    db.session.add(notification)
-            db.session.commit()
+            changes = []
+            if old_title != job.title:
+                changes.append(f"Title: {old_title} → {job.title}")
+            if old_company != job.company:
+                changes.append(f"Company: {old_company} → {job.company}")
+            if old_deadline != job.deadline:
+                changes.append(f"Deadline updated")
+            notify_applicants([job_id], f'Job "{job.title}" has been updated: ' + ', '.join(changes))
+        
+        db.session.commit()
+        _reindex(job.id)
         
         flash('Job updated successfully')
         return redirect(url_for('admin.index'))
@@ -205,51 +234,34 @@ def delete_job(job_id):
     
     if form.validate_on_submit():
         action = form.action.data
-        applications = Application.query.filter_by(job_id=job_id).all()
-        applicants = [app.user_id for app in applications]
         
         if action == 'delete':
             # Hard delete job and related applications
-            for app in applications:
-                db.session.delete(app)
+            Application.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+            JobRating.query.filter_by(job_id=job_id).delete()
             db.session.delete(job)
             db.session.commit()
+            _reindex(job_id, removed=True)
             flash('Job and all applications have been permanently deleted')
         elif action == 'mark_as_deleted':
-            # Mark as deleted and notify applicants
+            # Mark as deleted and notify applicants in the same transaction
             if hasattr(job, 'status'):
                 job.status = 'deleted'
             if hasattr(job, 'updated_at'):
                 job.updated_at = datetime.utcnow()
+            notify_applicants([job_id], f'Job "{job.title}" has been removed. Your application is no longer active.')
             db.session.commit()
-            
-            for user_id in applicants:
-                user = User.query.get(user_id)
-                if user:
-                    notification = Notification(
-                        user_id=user_id,
-                        message=f'Job "{job.title}" has been removed. Your application is no longer active.'
-                    )
-                    db.session.add(notification)
-            db.session.commit()
+            _reindex(job_id)
             flash('Job marked as deleted. Applicants have been notified.')
         elif action == 'archive':
-            # Archive and notify applicants
+            # Archive and notify applicants in the same transaction
             if hasattr(job, 'status'):
                 job.status = 'archived'
             if hasattr(job, 'updated_at'):
                 job.updated_at = datetime.utcnow()
+            notify_applicants([job_id], f'Job "{job.title}" has been archived. Your application status remains unchanged.')
             db.session.commit()
-            
-            for user_id in applicants:
-                user = User.query.get(user_id)
-                if user:
-                    notification = Notification(
-                        user_id=user_id,
-                        message=f'Job "{job.title}" has been archived. Your application status remains unchanged.'
-                    )
-                    db.session.add(notification)
-            db.session.commit()
+            _reindex(job_id)
             flash('Job archived. Applicants have been notified.')
         
         return redirect(url_for('admin.index'))
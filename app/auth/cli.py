@@ -0,0 +1,22 @@
+import click
+from .routes import bp
+
+
+@bp.cli.command('reap-tokens')
+@click.option('--batch-size', default=500, show_default=True, help='Rows deleted per transaction.')
+@click.option('--max-batches', default=None, type=int, help='Stop after this many batches per table.')
+def reap_tokens(batch_size, max_batches):
+    """Delete expired device, magic-link and admin tokens."""
+    from app.utils.token_reaper import reap_expired_tokens
+    report = reap_expired_tokens(batch_size=batch_size, max_batches=max_batches)
+    for table, stats in report.items():
+        click.echo(f"{table}: deleted={stats['deleted']} batches={stats['batches']} duration_ms={stats['duration_ms']}")
+
+
+@bp.cli.command('calibrate-bcrypt')
+@click.option('--target-ms', default=250, show_default=True, help='Target time for one password hash.')
+def calibrate_bcrypt(target_ms):
+    """Recommend a BCRYPT_LOG_ROUNDS value for this hardware."""
+    from app.utils.passwords import calibrate_cost, current_cost, MIN_COST
+    cost, base_ms = calibrate_cost(target_ms=target_ms)
+    click.echo(f"cost {MIN_COST} took {base_ms:.1f}ms; recommended BCRYPT_LOG_ROUNDS={cost} (current {current_cost()})")
@@ -1,11 +1,12 @@
 from flask import Blueprint, request, redirect, url_for, flash, make_response, render_template
 from flask import current_app
-from app.extensions import db, bcrypt
+from app.extensions import db
 from app.models import User, Token, DeviceToken
 import secrets
 from datetime import datetime, timedelta
 from app.forms import RegistrationForm, LoginForm, SetPasswordForm, ChangePasswordForm
-from app.utils.auth import get_current_user
+from app.utils.passwords import hash_password, check_password, needs_rehash
+from app.utils.auth import get_current_user, issue_device_token, set_device_cookie, find_device_token, invalidate_session, invalidate_user_sessions
 
 def generate_temp_password(length=12):
     import string
@@ -107,17 +108,16 @@ def login():
             flash('Invalid email or user not verified')
             return redirect(url_for('auth.login'))
         if user.password_hash and password:
-            if bcrypt.check_password_hash(user.password_hash, password):
+            if check_password(user.password_hash, password):
+                # Transparently upgrade hashes made at an older, cheaper cost
+                if needs_rehash(user.password_hash):
+                    user.password_hash = hash_password(password)
+                    current_app.logger.info("auth.login password_rehashed user=%s", user.id)
                 # Issue device token
-                device_token = secrets.token_urlsafe(64)
-                expires = datetime.utcnow() + timedelta(days=7)
-                token_hash = bcrypt.generate_password_hash(device_token[:72]).decode('utf-8')
-                device = DeviceToken(user_id=user.id, token_hash=token_hash, expires_at=expires)
-                db.session.add(device)
+                device_token = issue_device_token(user)
                 db.session.commit()
                 resp = make_response(redirect(url_for('users.dashboard')))
-                resp.set_cookie('device_token', device_token, httponly=True, secure=current_app.config.get('COOKIE_SECURE', False), samesite='Lax', max_age=7*24*3600)
-                return resp
+                return set_device_cookie(resp, device_token)
             else:
                 flash('Invalid password')
                 return redirect(url_for('auth.login'))
@@ -152,7 +152,7 @@ def verify(token):
         user.is_verified = True
         # Generate temp password
         temp_pw = generate_temp_password()
-        user.password_hash = bcrypt.generate_password_hash(temp_pw).decode('utf-8')
+        user.password_hash = hash_password(temp_pw)
         current_app.logger.info("auth.verify password_set user=%s", user.id)
         
         # Send temp password email with detailed logging
@@ -173,18 +173,24 @@ def verify(token):
             current_app.logger.error("auth.verify email_failed to=%s error=%s", user.email, error)
     token_obj.used = True
     # Issue device token
-    device_token = secrets.token_urlsafe(64)
-    expires = datetime.utcnow() + timedelta(days=7)
-    token_hash = bcrypt.generate_password_hash(device_token).decode('utf-8')
-    device = DeviceToken(user_id=user.id, token_hash=token_hash, expires_at=expires)
-    db.session.add(device)
+    device_token = issue_device_token(user)
     db.session.commit()
     resp = make_response(redirect(url_for('index')))
-    resp.set_cookie('device_token', device_token, httponly=True, secure=current_app.config.get('COOKIE_SECURE', False), samesite='Lax', max_age=7*24*3600)
-    return resp
+    return set_device_cookie(resp, device_token)
 
 @bp.route('/logout')
 def logout():
+    token = request.cookies.get('device_token')
+    invalidate_session(token)
+    # Revoke this device's token row, not just the cookie
+    if token:
+        try:
+            device = find_device_token(token)
+            if device:
+                db.session.delete(device)
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
     resp = make_response(redirect(url_for('auth.login')))
     # Clear cookie (match secure setting when clearing)
     resp.set_cookie('device_token', '', expires=0, secure=current_app.config.get('COOKIE_SECURE', False), httponly=True, samesite='Lax')
@@ -204,7 +210,7 @@ def set_password():
         if form.password.data != form.confirm_password.data:
             flash('Passwords do not match')
             return redirect(url_for('auth.set_password'))
-        user.password_hash = bcrypt.generate_password_hash(form.password.data).decode('utf-8')
+        user.password_hash = hash_password(form.password.data)
         db.session.commit()
         flash('Password set successfully')
         return redirect(url_for('users.dashboard'))
@@ -221,16 +227,17 @@ def change_password():
         return redirect(url_for('auth.set_password'))
     form = ChangePasswordForm()
     if form.validate_on_submit():
-        if not bcrypt.check_password_hash(user.password_hash, form.current_password.data):
+        if not check_password(user.password_hash, form.current_password.data):
             flash('Current password incorrect')
             return redirect(url_for('auth.change_password'))
         if form.new_password.data != form.confirm_password.data:
             flash('New passwords do not match')
             return redirect(url_for('auth.change_password'))
-        user.password_hash = bcrypt.generate_password_hash(form.new_password.data).decode('utf-8')
+        user.password_hash = hash_password(form.new_password.data)
         # Invalidate all device tokens
         DeviceToken.query.filter_by(user_id=user.id).delete()
         db.session.commit()
+        invalidate_user_sessions(user.id)
         flash('Password changed. All sessions invalidated.')
         return redirect(url_for('auth.login'))
     return render_template('auth/change_password.html', form=form)
\ No newline at end of file
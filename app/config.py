@@ -21,4 +21,112 @@ class Config:
     # Use secure cookies (only set to True in production with HTTPS)
     COOKIE_SECURE = os.environ.get('COOKIE_SECURE', 'False').lower() in ('1', 'true', 'yes')
     # PREFERRED_URL_SCHEME used by Flask for URL generation
-    PREFERRED_URL_SCHEME = os.environ.get('PREFERRED_URL_SCHEME') or 'https'
\ No newline at end of file
+    PREFERRED_URL_SCHEME = os.environ.get('PREFERRED_URL_SCHEME') or 'https'
+
+    # In-process authenticated-session cache (per worker). Entries are dropped on
+    # logout, password change and user updates in this worker; the TTL bounds
+    # staleness across workers.
+    SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', 2048))
+    SESSION_CACHE_TTL = int(os.environ.get('SESSION_CACHE_TTL', 60))
+
+    # Expired token reaper: seconds between in-process sweeps (0 disables; use
+    # `flask auth reap-tokens` from cron instead) and rows per delete batch.
+    TOKEN_REAPER_INTERVAL = int(os.environ.get('TOKEN_REAPER_INTERVAL', 0))
+    TOKEN_REAPER_BATCH_SIZE = int(os.environ.get('TOKEN_REAPER_BATCH_SIZE', 500))
+
+    # Deadline sweeper: seconds between in-process sweeps archiving overdue
+    # jobs (0 disables; use `flask jobs expire-deadlines` from cron instead)
+    # and jobs per batch.
+    DEADLINE_SWEEP_INTERVAL = int(os.environ.get('DEADLINE_SWEEP_INTERVAL', 0))
+    DEADLINE_SWEEP_BATCH_SIZE = int(os.environ.get('DEADLINE_SWEEP_BATCH_SIZE', 500))
+
+    # Password hashing: bcrypt cost, max concurrent hashes per process, and an
+    # optional startup calibration target (ms per hash; 0 keeps BCRYPT_LOG_ROUNDS).
+    # Up to PASSWORD_HASH_QUEUE more hashes may wait (default: one per worker);
+    # beyond that, or past the acquire/result timeouts (seconds), login and
+    # register answer 503 with Retry-After.
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0)) or None
+    PASSWORD_HASH_QUEUE = int(os.environ['PASSWORD_HASH_QUEUE']) if os.environ.get('PASSWORD_HASH_QUEUE') else None
+    PASSWORD_HASH_ACQUIRE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_ACQUIRE_TIMEOUT', 0.5))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 5))
+    PASSWORD_HASH_RETRY_AFTER = int(os.environ.get('PASSWORD_HASH_RETRY_AFTER', 2))
+    BCRYPT_CALIBRATE_MS = int(os.environ.get('BCRYPT_CALIBRATE_MS', 0))
+
+    # Seconds between reloads of the admin token revocation list per worker
+    ADMIN_REVOCATION_REFRESH = int(os.environ.get('ADMIN_REVOCATION_REFRESH', 30))
+
+    # Proxies in front of the app that append to X-Forwarded-For (Render: 1;
+    # 0 uses the socket peer). Rate limiting and request logs both use it.
+    TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', os.environ.get('RATELIMIT_TRUSTED_PROXIES', 1)))
+
+    # Rate limiting (see app/utils/ratelimit.py). Storage is 'memory' or
+    # 'sqlite:///path' to share counters between workers on one host.
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'True').lower() in ('1', 'true', 'yes')
+    RATELIMIT_STORAGE = os.environ.get('RATELIMIT_STORAGE') or 'memory'
+    RATELIMIT_METHODS = ('POST',)
+    # endpoint -> [(scope, max_hits, window_seconds), ...]
+    RATELIMITS = {
+        'auth.login': [('ip', 20, 300), ('email', 10, 300)],
+        'auth.register': [('ip', 5, 3600)],
+        'users.apply': [('user', 5, 10)],
+        'users.review': [('user', 5, 10)],
+    }
+
+    # /jobs listing page size (?per_page= may ask for up to the max)
+    JOBS_PAGE_SIZE = int(os.environ.get('JOBS_PAGE_SIZE', 24))
+    JOBS_MAX_PAGE_SIZE = int(os.environ.get('JOBS_MAX_PAGE_SIZE', 100))
+    # Full-text search results per page
+    SEARCH_PAGE_SIZE = int(os.environ.get('SEARCH_PAGE_SIZE', 20))
+    # Rendered job-card fragments: entry count, seconds and total byte budget
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE', 10000))
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 3600))
+    FRAGMENT_CACHE_BYTES = int(os.environ.get('FRAGMENT_CACHE_BYTES', 8 * 1024 * 1024))
+
+    # Salt for conditional-GET ETags; must be the same in every worker of a
+    # deploy and change between deploys (Render sets RENDER_GIT_COMMIT)
+    ETAG_SALT = os.environ.get('ETAG_SALT') or os.environ.get('RENDER_GIT_COMMIT', '')
+
+    # Reviews shown per page on a job's detail page
+    REVIEWS_PAGE_SIZE = int(os.environ.get('REVIEWS_PAGE_SIZE', 10))
+
+    # Notifications page size
+    NOTIFICATIONS_PAGE_SIZE = int(os.environ.get('NOTIFICATIONS_PAGE_SIZE', 20))
+    # Per-user unread counts for the nav badge: entries and seconds (other
+    # workers' writes show up within the TTL)
+    UNREAD_CACHE_SIZE = int(os.environ.get('UNREAD_CACHE_SIZE', 10000))
+    UNREAD_CACHE_TTL = int(os.environ.get('UNREAD_CACHE_TTL', 60))
+
+    # Request threads per worker; render.yaml passes the same WEB_THREADS to
+    # waitress-serve --threads (waitress's own default is 4).
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 4))
+
+    # Live notifications (/notifications/stream). Each open stream holds one
+    # server thread for its whole life, so at most SSE_THREAD_SHARE of
+    # WEB_THREADS may stream (SSE_MAX_CONNECTIONS overrides it) and the rest
+    # stay free for ordinary requests; see scripts/bench_sse_connections.py.
+    # Browsers open one stream per session, not per tab. Streams end after
+    # SSE_MAX_SECONDS and the browser reconnects SSE_RETRY_SECONDS later,
+    # replaying up to SSE_REPLAY_LIMIT missed events.
+    SSE_THREAD_SHARE = float(os.environ.get('SSE_THREAD_SHARE', 0.5))
+    SSE_MAX_CONNECTIONS = int(os.environ['SSE_MAX_CONNECTIONS']) if os.environ.get('SSE_MAX_CONNECTIONS') else None
+    SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', 100))
+    SSE_HEARTBEAT_SECONDS = int(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+    SSE_MAX_SECONDS = int(os.environ.get('SSE_MAX_SECONDS', 300))
+    SSE_RETRY_SECONDS = int(os.environ.get('SSE_RETRY_SECONDS', 5))
+    SSE_REPLAY_LIMIT = int(os.environ.get('SSE_REPLAY_LIMIT', 100))
+
+    # Page size for the /api/v1 applications and notifications lists
+    API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 20))
+
+    # "Similar jobs" on the detail page; the TF-IDF index is rebuilt every
+    # SIMILAR_JOBS_REFRESH seconds per worker (0 = only on demand / admin writes)
+    SIMILAR_JOBS_COUNT = int(os.environ.get('SIMILAR_JOBS_COUNT', 5))
+    SIMILAR_JOBS_REFRESH = int(os.environ.get('SIMILAR_JOBS_REFRESH', 0))
+
+    # Personalised dashboard: jobs shown, applications used for the profile,
+    # and the per-user ranking cache (entries, seconds)
+    DASHBOARD_JOBS = int(os.environ.get('DASHBOARD_JOBS', 6))
+    DASHBOARD_HISTORY = int(os.environ.get('DASHBOARD_HISTORY', 100))
+    DASHBOARD_CACHE_SIZE = int(os.environ.get('DASHBOARD_CACHE_SIZE', 5000))
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 600))
@@ -1,7 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_bcrypt import Bcrypt
+from app.utils.cache import TTLCache
+from app.utils.ratelimit import RateLimiter
 
 db = SQLAlchemy()
 migrate = Migrate()
-bcrypt = Bcrypt()
\ No newline at end of file
+bcrypt = Bcrypt()
+# Authenticated-session cache: device token digest -> compact user snapshot
+session_cache = TTLCache('SESSION_CACHE', maxsize=2048, ttl=60)
+limiter = RateLimiter()
\ No newline at end of file
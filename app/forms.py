@@ -1,5 +1,6 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, TextAreaField, SubmitField, EmailField, PasswordField, URLField, DateTimeField, RadioField
+from flask_wtf.file import FileField, FileRequired, FileAllowed
+from wtforms import StringField, TextAreaField, SubmitField, EmailField, PasswordField, URLField, DateTimeField, RadioField, BooleanField
 from wtforms.validators import DataRequired, Email, Length, Regexp, URL, Optional
 from datetime import datetime
 
@@ -25,6 +26,12 @@ class EditJobForm(FlaskForm):
     deadline = DateTimeField('Deadline (Optional)', validators=[Optional()], format='%Y-%m-%dT%H:%M')
     submit = SubmitField('Update Job')
 
+class ImportJobsForm(FlaskForm):
+    file = FileField('CSV or JSONL file', validators=[FileRequired(), FileAllowed(['csv', 'jsonl', 'ndjson', 'json'])])
+    notify = BooleanField('Notify users (one summary per user)', default=True)
+    dry_run = BooleanField('Validate only (dry run)')
+    submit = SubmitField('Import Jobs')
+
 class DeleteJobForm(FlaskForm):
     action = RadioField('Action', choices=[
         ('delete', 'Delete (Permanently remove job and applications)'),
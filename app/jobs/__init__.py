@@ -1 +1,3 @@
-from .routes import bp
\ No newline at end of file
+from .routes import bp
+from . import cli
+from . import api
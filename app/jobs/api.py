@@ -0,0 +1,171 @@
+"""Versioned JSON API (/api/v1) for the mobile UI.
+
+Lists use keyset cursors (`?cursor=` from the previous page's
+`next_cursor`) and job payloads accept `?fields=` sparse fieldsets; only
+the requested columns are loaded. Listings leave `description` out unless
+it is asked for. Bodies are serialized with orjson when installed and
+gzip-compressed for clients that accept it.
+"""
+import gzip
+import json
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy.orm import load_only, selectinload
+from app.extensions import db
+from app.models import Job, Application
+from app.notifications.feed import feed_page
+from app.utils.auth import get_current_user
+from app.utils.pagination import keyset_page, page_size
+from .routes import bp
+from .facets import parse_filters, apply_filters
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+API_PREFIX = '/api/v1'
+JOB_COLUMNS = ('id', 'title', 'company', 'location', 'salary', 'salary_band', 'deadline', 'status',
+               'apply_url', 'application_email', 'description', 'created_at', 'updated_at')
+# Not columns: the review aggregate, loaded only when asked for
+JOB_EXTRAS = ('rating',)
+DEFAULT_LIST_FIELDS = tuple(f for f in JOB_COLUMNS if f not in ('description', 'application_email')) + JOB_EXTRAS
+DEFAULT_DETAIL_FIELDS = JOB_COLUMNS + JOB_EXTRAS
+GZIP_MIN_BYTES = 1024
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def dumps(payload):
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def api_response(payload, status=200):
+    body = dumps(payload)
+    response = current_app.response_class(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings:
+        response.set_data(gzip.compress(body, compresslevel=5))
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def api_error(message, status):
+    return api_response({'error': message}, status)
+
+
+def api_login_required(f):
+    """Like login_required, but answers 401 JSON instead of redirecting."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not get_current_user():
+            return api_error('Authentication required', 401)
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def requested_fields(default):
+    """Parse ?fields=a,b; unknown names are rejected so typos are visible."""
+    raw = request.args.get('fields')
+    if not raw:
+        return default, None
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in JOB_COLUMNS + JOB_EXTRAS]
+    if unknown:
+        return None, f"Unknown field(s): {', '.join(unknown)}"
+    return ('id',) + tuple(f for f in fields if f != 'id'), None
+
+
+def job_options(fields):
+    columns = [getattr(Job, f) for f in fields if f in JOB_COLUMNS]
+    # keyset pagination needs created_at on every row
+    columns.append(Job.created_at)
+    options = [load_only(*columns)]
+    if 'rating' in fields:
+        options.append(selectinload(Job.rating))
+    return options
+
+
+def rating_payload(rating):
+    if rating is None or not rating.count:
+        return {'average': None, 'count': 0}
+    return {'average': rating.average, 'count': rating.count}
+
+
+def job_payload(job, fields):
+    data = {}
+    for field in fields:
+        if field == 'rating':
+            data['rating'] = rating_payload(job.rating)
+        else:
+            data[field] = getattr(job, field)
+    return data
+
+
+@bp.route(f'{API_PREFIX}/jobs')
+@api_login_required
+def api_jobs():
+    fields, error = requested_fields(DEFAULT_LIST_FIELDS)
+    if error:
+        return api_error(error, 400)
+    filters = parse_filters(request.args)
+    query = apply_filters(Job.query.options(*job_options(fields)), filters)
+    jobs, next_cursor = keyset_page(query, Job.created_at, Job.id, request.args.get('cursor'),
+                                    page_size('JOBS_PAGE_SIZE', max_key='JOBS_MAX_PAGE_SIZE'))
+    return api_response({'data': [job_payload(job, fields) for job in jobs], 'next_cursor': next_cursor})
+
+
+@bp.route(f'{API_PREFIX}/jobs/<int:job_id>')
+@api_login_required
+def api_job_detail(job_id):
+    fields, error = requested_fields(DEFAULT_DETAIL_FIELDS)
+    if error:
+        return api_error(error, 400)
+    user = get_current_user()
+    job = Job.query.options(*job_options(fields)).filter(Job.id == job_id).first()
+    if job is None:
+        return api_error('Not found', 404)
+    application = (db.session.query(Application.id, Application.status, Application.applied_at)
+                   .filter(Application.user_id == user.id, Application.job_id == job_id).first())
+    data = job_payload(job, fields)
+    data['application'] = dict(application._mapping) if application else None
+    return api_response({'data': data})
+
+
+@bp.route(f'{API_PREFIX}/applications')
+@api_login_required
+def api_applications():
+    user = get_current_user()
+    query = (Application.query
+             .options(load_only(Application.id, Application.job_id, Application.status, Application.applied_at),
+                      selectinload(Application.job).load_only(Job.id, Job.title, Job.company, Job.status))
+             .filter(Application.user_id == user.id))
+    items, next_cursor = keyset_page(query, Application.applied_at, Application.id, request.args.get('cursor'),
+                                     page_size('API_PAGE_SIZE', max_key='JOBS_MAX_PAGE_SIZE'))
+    data = [{
+        'id': a.id,
+        'status': a.status,
+        'applied_at': a.applied_at,
+        'job': {'id': a.job.id, 'title': a.job.title, 'company': a.job.company, 'status': a.job.status},
+    } for a in items]
+    return api_response({'data': data, 'next_cursor': next_cursor})
+
+
+@bp.route(f'{API_PREFIX}/notifications')
+@api_login_required
+def api_notifications():
+    user = get_current_user()
+    items, next_cursor = feed_page(user.id, request.args.get('cursor'),
+                                   page_size('API_PAGE_SIZE', max_key='JOBS_MAX_PAGE_SIZE'),
+                                   unread_only=request.args.get('unread') in ('1', 'true'))
+    data = [{'id': n.id, 'kind': n.kind, 'message': n.message, 'read': bool(n.read), 'created_at': n.created_at}
+            for n in items]
+    return api_response({'data': data, 'next_cursor': next_cursor})
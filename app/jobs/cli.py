@@ -0,0 +1,88 @@
+import time
+import click
+from .routes import bp
+
+
+@bp.cli.command('reindex-search')
+def reindex_search():
+    """Rebuild the full-text job search index from the job table."""
+    from .search import rebuild_search_index, backend
+    started = time.perf_counter()
+    count = rebuild_search_index()
+    click.echo(f"indexed {count} jobs with backend={backend()} in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+@bp.cli.command('backfill-salary-bands')
+@click.option('--batch-size', default=1000, show_default=True)
+def backfill_salary_bands_command(batch_size):
+    """Compute salary_band for jobs saved before the column existed."""
+    from .facets import backfill_salary_bands
+    click.echo(f"updated {backfill_salary_bands(batch_size=batch_size)} jobs")
+
+
+@bp.cli.command('import')
+@click.argument('path', type=click.Path(allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help='Defaults to the file extension.')
+@click.option('--batch-size', default=500, show_default=True)
+@click.option('--posted-by', help='Email of the posting admin (defaults to the first admin user).')
+@click.option('--notify/--no-notify', default=True, show_default=True, help='Send one summary notification per user.')
+@click.option('--dry-run', is_flag=True, help='Validate rows without writing anything.')
+def import_command(path, fmt, batch_size, posted_by, notify, dry_run):
+    """Stream jobs from a CSV or JSONL file ('-' for stdin)."""
+    from app.models import User
+    from .importer import detect_format, import_jobs
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise click.UsageError('cannot tell the format from the file name; pass --format')
+    query = User.query.filter_by(email=posted_by) if posted_by else User.query.filter_by(role='admin')
+    poster = query.first()
+    if poster is None:
+        raise click.UsageError('no posting user found; pass --posted-by with an existing email')
+    with click.open_file(path, 'r', encoding='utf-8-sig') as stream:
+        report = import_jobs(stream, fmt, poster.id, batch_size=batch_size, notify=notify, dry_run=dry_run)
+    for line_number, error in report['errors']:
+        click.echo(f"line {line_number}: {error}", err=True)
+    if report['rejected'] > len(report['errors']):
+        click.echo(f"... and {report['rejected'] - len(report['errors'])} more rejected rows", err=True)
+    click.echo(
+        f"rows={report['rows']} inserted={report['inserted']} rejected={report['rejected']} "
+        f"notified={report['notified']} seconds={report['seconds']} rows_per_sec={report['rows_per_sec']}"
+        + (" (dry run)" if dry_run else "")
+    )
+
+
+@bp.cli.command('rebuild-similar')
+@click.option('--sample', default=200, show_default=True, help='Jobs to time top-k lookups on.')
+@click.option('-k', default=5, show_default=True)
+def rebuild_similar_command(sample, k):
+    """Build the "similar jobs" TF-IDF index and report its cost."""
+    import tracemalloc
+    from app.extensions import db
+    from app.models import Job
+    from .similar import available, similarity_index, rebuild_similarity_index
+    if not available():
+        raise click.ClickException('NumPy is not installed; similar jobs use the search fallback')
+    tracemalloc.start()
+    stats = rebuild_similarity_index()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    click.echo(f"jobs={stats['jobs']} terms={stats['terms']} postings={stats['postings']} "
+               f"index_mb={stats['bytes'] / 1e6:.1f} peak_build_mb={peak / 1e6:.1f} "
+               f"build_seconds={stats['build_seconds']}")
+    jobs = (Job.query.filter_by(status='active').order_by(db.func.random()).limit(sample).all())
+    if jobs:
+        started = time.perf_counter()
+        for job in jobs:
+            similarity_index.similar(job.id, job.title, job.company, job.description, k)
+        click.echo(f"top-{k} lookup avg_ms={(time.perf_counter() - started) * 1000 / len(jobs):.2f} over {len(jobs)} jobs")
+
+
+@bp.cli.command('expire-deadlines')
+@click.option('--batch-size', default=500, show_default=True)
+@click.option('--max-batches', type=int, help='Stop after this many batches (default: until none are left).')
+def expire_deadlines_command(batch_size, max_batches):
+    """Archive active jobs whose deadline has passed and notify their applicants."""
+    from .expiry import expire_overdue_jobs
+    report = expire_overdue_jobs(batch_size=batch_size, max_batches=max_batches)
+    click.echo(f"archived={report['archived']} notified={report['notified']} "
+               f"batches={report['batches']} duration_ms={report['duration_ms']}")
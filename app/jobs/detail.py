@@ -0,0 +1,56 @@
+"""Loaders for the job detail page and the application details endpoint.
+
+`load_job_detail` needs two statements: one for the job plus everything
+about it that is per user (rating aggregate, the user's application and
+review), and one for the page of reviews with reviewer names.
+`load_application_details` fetches an application with its job and the
+owner's review in a single statement.
+"""
+from collections import namedtuple
+from sqlalchemy.orm import aliased, contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
+from app.extensions import db
+from app.models import Job, JobRating, Application, Review, User
+from app.utils.pagination import keyset_page
+
+
+JobDetail = namedtuple('JobDetail', 'job rating application user_review reviews next_reviews_cursor')
+
+
+def load_job_detail(job_id, user_id, reviews_cursor=None, reviews_per_page=10):
+    """Return a JobDetail, or None if the job does not exist."""
+    user_review = aliased(Review)
+    row = db.session.execute(
+        db.select(Job, JobRating, Application, user_review)
+        .outerjoin(JobRating, JobRating.job_id == Job.id)
+        .outerjoin(Application, db.and_(Application.job_id == Job.id, Application.user_id == user_id))
+        .outerjoin(user_review, db.and_(user_review.job_id == Job.id, user_review.user_id == user_id))
+        .where(Job.id == job_id)
+        .limit(1)
+    ).first()
+    if row is None:
+        return None
+    job, rating, application, own_review = row
+    # Populate the relationship so templates touching job.rating don't lazy-load it
+    set_committed_value(job, 'rating', rating)
+    reviews, next_cursor = keyset_page(
+        Review.query.join(Review.reviewer)
+        .options(contains_eager(Review.reviewer).load_only(User.id, User.name))
+        .filter(Review.job_id == job_id),
+        Review.created_at, Review.id, reviews_cursor, reviews_per_page,
+    )
+    return JobDetail(job=job, rating=rating, application=application, user_review=own_review,
+                     reviews=reviews, next_reviews_cursor=next_cursor)
+
+
+def load_application_details(application_id):
+    """Return (application, job, owner's review or None), or None if missing."""
+    review = aliased(Review)
+    row = db.session.execute(
+        db.select(Application, Job, review)
+        .join(Job, Job.id == Application.job_id)
+        .outerjoin(review, db.and_(review.job_id == Application.job_id, review.user_id == Application.user_id))
+        .where(Application.id == application_id)
+        .limit(1)
+    ).first()
+    return tuple(row) if row is not None else None
@@ -0,0 +1,68 @@
+"""Archive active jobs whose application deadline has passed.
+
+Run from cron with `flask jobs expire-deadlines`, or in each worker every
+DEADLINE_SWEEP_INTERVAL seconds. Each batch picks at most `batch_size`
+overdue ids through ix_job_status_deadline. An UPDATE ... RETURNING then
+archives them, still guarded by status = 'active', so two workers sweeping
+at once never archive (or notify about) the same job twice. The jobs'
+applicants are notified with one INSERT ... SELECT, and the batch commits
+on its own, so no transaction stays open for long.
+"""
+import time
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import Job
+from app.notifications.fanout import notify_applicants
+from app.utils.fragments import fragment_cache
+from .facets import facet_cache
+from .search import index_jobs
+from .similar import drop_from_similarity
+
+
+def _deadline_message():
+    return (db.literal('The application deadline for "') + Job.title + db.literal('" at ')
+            + Job.company + db.literal(' has passed. The job is now closed.'))
+
+
+def expire_overdue_jobs(batch_size=500, max_batches=None, now=None):
+    """Archive overdue active jobs in batches. Returns a report dict.
+
+    The report has archived, notified, batches and duration_ms.
+    """
+    now = now or datetime.utcnow()
+    report = {'archived': 0, 'notified': 0, 'batches': 0}
+    started = time.perf_counter()
+    while max_batches is None or report['batches'] < max_batches:
+        batch_started = time.perf_counter()
+        ids = db.session.execute(
+            db.select(Job.id).where(Job.status == 'active', Job.deadline < now)
+            .order_by(Job.deadline).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        archived = db.session.execute(
+            db.update(Job).where(Job.id.in_(ids), Job.status == 'active')
+            .values(status='archived', updated_at=db.func.now()).returning(Job.id),
+            execution_options={'synchronize_session': False},
+        ).scalars().all()
+        notified = notify_applicants(archived, _deadline_message()) if archived else 0
+        db.session.commit()
+        # Core writes skip the ORM events that keep these in step
+        index_jobs(archived)
+        drop_from_similarity(archived)
+        for job_id in archived:
+            fragment_cache.invalidate_tag(job_id)
+        report['batches'] += 1
+        report['archived'] += len(archived)
+        report['notified'] += notified
+        current_app.logger.info(
+            "jobs.expire batch=%s archived=%s notified=%s duration_ms=%.1f",
+            report['batches'], len(archived), notified, (time.perf_counter() - batch_started) * 1000
+        )
+        if len(ids) < batch_size:
+            break
+    if report['archived']:
+        facet_cache.clear()
+    report['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return report
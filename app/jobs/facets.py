@@ -0,0 +1,156 @@
+"""Filters and cached facet counts for the /jobs listing.
+
+Facets: location, company, salary band and "closing this week". Counts come
+from one GROUP BY per facet over active jobs, honouring the *other* selected
+filters (so picking a company still shows how many jobs every location has
+within it). Results are cached per filter combination and the whole cache is
+dropped whenever a commit inserts, updates or deletes a Job row.
+"""
+import re
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.extensions import db
+from app.models import Job
+from app.utils.cache import TTLCache
+
+# Salary is free text ("8 LPA", "₹6,00,000", "40k/month"); bucket it in lakhs per annum
+SALARY_BANDS = [
+    ('lt5', 'Under 5 LPA', 0, 5),
+    ('5to10', '5–10 LPA', 5, 10),
+    ('10to20', '10–20 LPA', 10, 20),
+    ('20plus', '20+ LPA', 20, None),
+]
+SALARY_BAND_LABELS = {key: label for key, label, _, _ in SALARY_BANDS}
+FACET_LIMIT = 15
+CLOSING_SOON_DAYS = 7
+
+facet_cache = TTLCache('FACET_CACHE', maxsize=256, ttl=300)
+STALE_FACETS_KEY = 'stale_facets'
+
+
+def salary_band(salary):
+    """Map a free-text salary to a SALARY_BANDS key, or None if unparseable."""
+    if not salary:
+        return None
+    text = salary.lower().replace(',', '')
+    match = re.search(r'\d+(?:\.\d+)?', text)
+    if not match:
+        return None
+    value = float(match.group(0))
+    if re.search(r'\d\s*k\b', text):
+        value *= 1000
+    if 'month' in text or '/m' in text or 'pm' in text.split():
+        value *= 12
+    if value >= 1000:
+        value /= 100000  # rupees per annum -> lakhs
+    for key, _, low, high in SALARY_BANDS:
+        if value >= low and (high is None or value < high):
+            return key
+    return None
+
+
+@event.listens_for(Job, 'before_insert')
+@event.listens_for(Job, 'before_update')
+def _set_salary_band(mapper, connection, target):
+    # '' marks "computed, not parseable"; NULL means not computed yet
+    target.salary_band = salary_band(target.salary) or ''
+
+
+@event.listens_for(Job, 'after_insert')
+@event.listens_for(Job, 'after_update')
+@event.listens_for(Job, 'after_delete')
+def _invalidate_facets(mapper, connection, target):
+    # Cleared on commit: clearing now would let another request cache pre-commit counts
+    object_session(target).info[STALE_FACETS_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _clear_stale_facets(session):
+    if session.info.pop(STALE_FACETS_KEY, False):
+        facet_cache.clear()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _keep_facets(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(STALE_FACETS_KEY, None)
+
+
+def parse_filters(args):
+    """Normalise listing filters from request args."""
+    filters = {}
+    for name in ('location', 'company'):
+        value = (args.get(name) or '').strip()
+        if value:
+            filters[name] = value
+    band = args.get('salary')
+    if band in SALARY_BAND_LABELS:
+        filters['salary'] = band
+    if args.get('closing') == 'week':
+        filters['closing'] = 'week'
+    return filters
+
+
+def _conditions(filters, exclude=None, now=None):
+    now = now or datetime.utcnow()
+    conds = [Job.status == 'active']
+    if 'location' in filters and exclude != 'location':
+        conds.append(Job.location == filters['location'])
+    if 'company' in filters and exclude != 'company':
+        conds.append(Job.company == filters['company'])
+    if 'salary' in filters and exclude != 'salary':
+        conds.append(Job.salary_band == filters['salary'])
+    if 'closing' in filters and exclude != 'closing':
+        conds.append(Job.deadline >= now)
+        conds.append(Job.deadline < now + timedelta(days=CLOSING_SOON_DAYS))
+    return conds
+
+
+def apply_filters(query, filters):
+    return query.filter(*_conditions(filters))
+
+
+def _grouped(column, conds, limit=FACET_LIMIT):
+    rows = (db.session.query(column, db.func.count(Job.id))
+            .filter(*conds, column.isnot(None), column != '')
+            .group_by(column)
+            .order_by(db.func.count(Job.id).desc(), column)
+            .limit(limit).all())
+    return [(value, count) for value, count in rows]
+
+
+def facet_counts(filters):
+    """Return {'location': [(value, n)], 'company': [...], 'salary': [...], 'closing': n}."""
+    key = tuple(sorted(filters.items()))
+    cached = facet_cache.get(key)
+    if cached is not None:
+        return cached
+    now = datetime.utcnow()
+    bands = dict(_grouped(Job.salary_band, _conditions(filters, 'salary', now), limit=None))
+    counts = {
+        'location': _grouped(Job.location, _conditions(filters, 'location', now)),
+        'company': _grouped(Job.company, _conditions(filters, 'company', now)),
+        'salary': [(band, bands[band]) for band, _, _, _ in SALARY_BANDS if band in bands],
+        'closing': db.session.query(db.func.count(Job.id)).filter(
+            *_conditions(dict(filters, closing='week'), None, now)).scalar(),
+    }
+    facet_cache.set(key, counts)
+    return counts
+
+
+def backfill_salary_bands(batch_size=1000):
+    """Populate salary_band for rows written before the column existed."""
+    updated = 0
+    while True:
+        rows = (db.session.query(Job.id, Job.salary)
+                .filter(Job.salary_band.is_(None), Job.salary.isnot(None), Job.salary != '')
+                .order_by(Job.id).limit(batch_size).all())
+        changes = [{'id': job_id, 'salary_band': salary_band(salary) or ''} for job_id, salary in rows]
+        if not changes:
+            break
+        db.session.bulk_update_mappings(Job, changes)
+        db.session.commit()
+        updated += len(changes)
+    facet_cache.clear()
+    return updated
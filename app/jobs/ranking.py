@@ -0,0 +1,139 @@
+"""Personalised job ranking for the dashboard.
+
+A user's profile is the sum of the TF-IDF vectors (from the similar-jobs
+index) of the jobs they applied to, plus (rating - 3) / 2 times the vector
+of each job they reviewed, so a 1-2 star review pushes similar jobs down.
+Active jobs are scored against the profile in one pass over the inverted
+index (`SimilarityIndex.search`), excluding the jobs already applied to.
+
+The profile and the resulting top jobs are cached per user. After an
+application or review, `record_interaction` adds that one job's vector to
+the cached profile and re-scores, without reloading the user's history.
+Entries computed against an older index build are recomputed. Until the
+index is ready, and for users with no history, the newest active jobs are
+shown.
+"""
+from collections import namedtuple
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.orm import load_only, selectinload
+from app.extensions import db
+from app.models import Job, Application, Review
+from app.utils.cache import TTLCache
+from .similar import similarity_index, ensure_index
+
+APPLY_WEIGHT = 1.0
+# Profile terms kept per user and used when scoring
+PROFILE_TERMS = 100
+# Ranked ids kept per user; more than are shown, so a few jobs closing doesn't empty the list
+RANKED_IDS = 30
+
+dashboard_cache = TTLCache('DASHBOARD_CACHE', maxsize=5000, ttl=600)
+
+Ranking = namedtuple('Ranking', 'generation profile seen job_ids')
+
+
+def review_weight(rating):
+    """Profile weight of a review: +1 for 5 stars, -1 for 1 star, 0 for none."""
+    if rating not in range(1, 6):
+        return 0.0
+    return (rating - 3) / 2.0
+
+
+def _add(profile, job, weight):
+    cols, weights = similarity_index.vector(job.title, job.company, job.description)
+    for col, value in zip(cols, weights):
+        profile[col] = profile.get(col, 0.0) + weight * float(value)
+
+
+def _trim(profile):
+    # Terms cancelled out by a low review carry no signal
+    profile = {col: weight for col, weight in profile.items() if abs(weight) > 1e-6}
+    if len(profile) <= PROFILE_TERMS:
+        return profile
+    strongest = sorted(profile, key=lambda col: -abs(profile[col]))[:PROFILE_TERMS]
+    return {col: profile[col] for col in strongest}
+
+
+def _history(user_id, limit):
+    """The user's most recent applications with the job text and their rating, in one query."""
+    return db.session.execute(
+        db.select(Application.job_id, Job.title, Job.company, Job.description, Review.rating)
+        .join(Job, Job.id == Application.job_id)
+        .outerjoin(Review, db.and_(Review.job_id == Application.job_id, Review.user_id == Application.user_id))
+        .where(Application.user_id == user_id)
+        .order_by(Application.applied_at.desc())
+        .limit(limit)
+    ).all()
+
+
+def _score(generation, profile, seen):
+    profile = _trim(profile)
+    cols = list(profile)
+    results = similarity_index.search(cols, [profile[c] for c in cols], RANKED_IDS,
+                                      exclude=seen, max_terms=PROFILE_TERMS)
+    return Ranking(generation, profile, seen, [job_id for job_id, _ in results])
+
+
+def _build(user_id):
+    generation = similarity_index.built_at
+    profile, seen = {}, set()
+    for row in _history(user_id, current_app.config.get('DASHBOARD_HISTORY', 100)):
+        seen.add(row.job_id)
+        _add(profile, row, APPLY_WEIGHT + review_weight(row.rating))
+    if not profile:
+        return None
+    return _score(generation, profile, frozenset(seen))
+
+
+def ranked_job_ids(user_id):
+    """Job ids ranked for the user, best first, or None to use the newest jobs instead."""
+    if not ensure_index():
+        return None
+    ranking = dashboard_cache.get(user_id)
+    if ranking is None or ranking.generation != similarity_index.built_at:
+        ranking = _build(user_id)
+        if ranking is None:
+            return None
+        dashboard_cache.set(user_id, ranking)
+    return ranking.job_ids
+
+
+def record_interaction(user_id, job, weight):
+    """Fold one application or review into the user's cached ranking, if there is one."""
+    ranking = dashboard_cache.get(user_id)
+    if ranking is None:
+        return
+    if ranking.generation != similarity_index.built_at or not similarity_index.ready:
+        dashboard_cache.pop(user_id)
+        return
+    profile = dict(ranking.profile)
+    if weight:
+        _add(profile, job, weight)
+    dashboard_cache.set(user_id, _score(ranking.generation, profile, ranking.seen | {job.id}))
+
+
+def dashboard_jobs(user_id, count):
+    """Up to `count` active jobs for the dashboard, best ranked first.
+
+    One query loads the ranked jobs together with the `count` newest active
+    ones, which pad the list when too few ranked jobs are still open. Only
+    Job.CARD_COLUMNS are loaded.
+    """
+    query = (Job.query.options(load_only(*[getattr(Job, c) for c in Job.CARD_COLUMNS]), selectinload(Job.rating))
+             .filter(Job.status == 'active'))
+    newest = (Job.created_at.desc(), Job.id.desc())
+    job_ids = ranked_job_ids(user_id)
+    if not job_ids:
+        return query.order_by(*newest).limit(count).all()
+    newest_ids = db.select(Job.id).where(Job.status == 'active').order_by(*newest).limit(count)
+    rows = query.filter(db.or_(Job.id.in_(job_ids), Job.id.in_(newest_ids))).all()
+    by_id = {job.id: job for job in rows}
+    jobs = [by_id[i] for i in job_ids if i in by_id][:count]
+    if len(jobs) < count:
+        # Too few matches still open: pad with the newest jobs
+        shown = {job.id for job in jobs}
+        rest = sorted((job for job in rows if job.id not in shown),
+                      key=lambda job: (job.created_at or datetime.min, job.id), reverse=True)
+        jobs += rest[:count - len(jobs)]
+    return jobs
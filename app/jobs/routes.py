@@ -1,3 +1,18 @@
-from flask import Blueprint
+from flask import Blueprint, render_template, request, current_app
+from app.utils.decorators import login_required
 
-bp = Blueprint('jobs', __name__)
\ No newline at end of file
+bp = Blueprint('jobs', __name__)
+
+
+@bp.route('/jobs/search')
+@login_required
+def search():
+    from .search import search_jobs
+    query = (request.args.get('q') or '').strip()
+    try:
+        page = max(1, int(request.args.get('page', 1)))
+    except ValueError:
+        page = 1
+    per_page = current_app.config.get('SEARCH_PAGE_SIZE', 20)
+    results, has_next = search_jobs(query, page=page, per_page=per_page) if query else ([], False)
+    return render_template('jobs/search.html', q=query, results=results, page=page, has_next=has_next)
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""Full-text job search over title, company and description.
+
+Two backends, picked from the database dialect at startup:
+
+- PostgreSQL: a `job_search` side table holding a weighted tsvector
+  (title A, company B, description C) with a GIN index, ranked by ts_rank_cd
+  and highlighted with ts_headline.
+- SQLite: an FTS5 virtual table `job_fts` ranked with bm25(); snippets are
+  cut in Python for the rows of the current page only.
+
+If neither is available (e.g. SQLite built without FTS5) search degrades to
+an unranked LIKE scan. Only active jobs are indexed, so ranking never has to
+join back to `job` to filter by status. The index is maintained
+incrementally: admin writes call `index_job` / `remove_job` after committing
+and bulk imports call `index_jobs` once per batch.
+"""
+import re
+from flask import current_app
+from markupsafe import Markup, escape
+from sqlalchemy import bindparam, text
+from app.extensions import db
+from app.models import Job
+
+MARK_START = '\x02'
+MARK_END = '\x03'
+MAX_TERMS = 10
+
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def backend():
+    return current_app.extensions.get('job_search', 'like')
+
+
+def ensure_search_index(app):
+    """Create the search structures if missing; backfill them when new."""
+    dialect = db.engine.dialect.name
+    created = False
+    if dialect == 'postgresql':
+        exists = db.session.execute(text("SELECT to_regclass('job_search')")).scalar()
+        db.session.execute(text(
+            "CREATE TABLE IF NOT EXISTS job_search ("
+            " job_id integer PRIMARY KEY REFERENCES job(id) ON DELETE CASCADE,"
+            " document tsvector NOT NULL)"
+        ))
+        db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_job_search_document ON job_search USING GIN (document)"))
+        db.session.commit()
+        app.extensions['job_search'] = 'postgresql'
+        created = exists is None
+    elif dialect == 'sqlite':
+        try:
+            exists = db.session.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'job_fts'"
+            )).first()
+            db.session.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS job_fts USING fts5("
+                "title, company, description, tokenize = 'porter unicode61')"
+            ))
+            db.session.commit()
+            app.extensions['job_search'] = 'fts5'
+            created = exists is None
+        except Exception:
+            db.session.rollback()
+            app.logger.warning("search.fts5_unavailable falling back to LIKE search")
+            app.extensions['job_search'] = 'like'
+    else:
+        app.extensions['job_search'] = 'like'
+    if created:
+        count = rebuild_search_index()
+        app.logger.info("search.index_built backend=%s jobs=%s", app.extensions['job_search'], count)
+    return created
+
+
+def index_job(job_id):
+    """(Re)index a single job after it was created, edited or changed status.
+
+    Only active jobs are kept in the index, so a job that was archived or
+    deleted simply drops out of it.
+    """
+    index_jobs([job_id])
+
+
+def index_jobs(job_ids):
+    """(Re)index a batch of jobs with one DELETE and one INSERT ... SELECT."""
+    job_ids = list(job_ids)
+    kind = backend()
+    if not job_ids or kind not in ('postgresql', 'fts5'):
+        return
+    ids = bindparam('ids', expanding=True)
+    if kind == 'postgresql':
+        db.session.execute(text("DELETE FROM job_search WHERE job_id IN :ids").bindparams(ids), {'ids': job_ids})
+        db.session.execute(text(
+            f"INSERT INTO job_search (job_id, document) SELECT id, {_PG_DOCUMENT} FROM job "
+            "WHERE id IN :ids AND status = 'active'"
+        ).bindparams(ids), {'ids': job_ids})
+    else:
+        db.session.execute(text("DELETE FROM job_fts WHERE rowid IN :ids").bindparams(ids), {'ids': job_ids})
+        db.session.execute(text(
+            "INSERT INTO job_fts (rowid, title, company, description) "
+            "SELECT id, title, company, description FROM job WHERE id IN :ids AND status = 'active'"
+        ).bindparams(ids), {'ids': job_ids})
+    db.session.commit()
+
+
+def remove_job(job_id):
+    kind = backend()
+    if kind == 'postgresql':
+        db.session.execute(text("DELETE FROM job_search WHERE job_id = :id"), {'id': job_id})
+    elif kind == 'fts5':
+        db.session.execute(text("DELETE FROM job_fts WHERE rowid = :id"), {'id': job_id})
+    else:
+        return
+    db.session.commit()
+
+
+def rebuild_search_index():
+    """Rebuild the whole index from active jobs. Returns the number indexed."""
+    kind = backend()
+    if kind == 'postgresql':
+        db.session.execute(text("TRUNCATE job_search"))
+        db.session.execute(text(
+            f"INSERT INTO job_search (job_id, document) SELECT id, {_PG_DOCUMENT} FROM job WHERE status = 'active'"
+        ))
+    elif kind == 'fts5':
+        db.session.execute(text("DELETE FROM job_fts"))
+        db.session.execute(text(
+            "INSERT INTO job_fts (rowid, title, company, description) "
+            "SELECT id, title, company, description FROM job WHERE status = 'active'"
+        ))
+    db.session.commit()
+    return db.session.query(db.func.count(Job.id)).filter(Job.status == 'active').scalar()
+
+
+def _terms(query):
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+def _fts5_match(terms):
+    # Quote every term so user input can never be parsed as FTS5 syntax;
+    # the last term is a prefix match for type-ahead style queries.
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def make_snippet(body, terms, width=200):
+    """Cut a window of `body` around the first matching term and mark matches.
+
+    Used for the SQLite backends, where asking FTS5 for snippet() would make
+    it build one for every matching row before the LIMIT applies.
+    """
+    body = body or ''
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\w*', re.IGNORECASE)
+    match = pattern.search(body)
+    start = max(0, match.start() - width // 4) if match else 0
+    window = body[start:start + width]
+    marked = pattern.sub(lambda m: f'{MARK_START}{m.group(0)}{MARK_END}', window)
+    return ('…' if start else '') + marked + ('…' if start + width < len(body) else '')
+
+
+def highlight(snippet):
+    """Escape a backend snippet and turn the sentinel markers into <mark>."""
+    if not snippet:
+        return Markup('')
+    safe = str(escape(snippet))
+    return Markup(safe.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def _card_rows(ranked, terms):
+    """Load card fields for ranked (id, score) pairs, preserving rank order."""
+    if not ranked:
+        return []
+    jobs = {j.id: j for j in Job.query.filter(Job.id.in_([r[0] for r in ranked])).all()}
+    rows = []
+    for job_id, score in ranked:
+        job = jobs.get(job_id)
+        if job is None:
+            continue
+        rows.append({'id': job.id, 'title': job.title, 'company': job.company, 'location': job.location,
+                     'score': score, 'snippet': make_snippet(job.description, terms)})
+    return rows
+
+
+def search_jobs(query, page=1, per_page=20):
+    """Ranked search over active jobs.
+
+    Returns (results, has_next) where results are dicts with id, title,
+    company, location, score and an HTML-safe `snippet`.
+    """
+    terms = _terms(query)
+    if not terms:
+        return [], False
+    page = max(1, page)
+    params = {'limit': per_page + 1, 'offset': (page - 1) * per_page}
+    kind = backend()
+    if kind == 'postgresql':
+        # Rank inside the GIN-backed side table, then headline only the page
+        params.update(q=query, opts=f'StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=35, MinWords=15, MaxFragments=2')
+        rows = db.session.execute(text(
+            "WITH q AS (SELECT websearch_to_tsquery('english', :q) AS query), "
+            "page AS ("
+            " SELECT s.job_id AS id, ts_rank_cd(s.document, q.query) AS score"
+            " FROM job_search s, q WHERE s.document @@ q.query"
+            " ORDER BY score DESC, s.job_id DESC LIMIT :limit OFFSET :offset) "
+            "SELECT j.id, j.title, j.company, j.location, page.score,"
+            " ts_headline('english', j.description, q.query, :opts) AS snippet "
+            "FROM page JOIN job j ON j.id = page.id, q "
+            "ORDER BY page.score DESC, j.id DESC"
+        ), params).mappings().all()
+    elif kind == 'fts5':
+        params['q'] = _fts5_match(terms)
+        ranked = db.session.execute(text(
+            "SELECT rowid, bm25(job_fts, 10.0, 5.0, 1.0) AS score FROM job_fts "
+            "WHERE job_fts MATCH :q ORDER BY score, rowid DESC LIMIT :limit OFFSET :offset"
+        ), params).all()
+        rows = _card_rows([(r[0], r[1]) for r in ranked], terms)
+    else:
+        like = db.session.query(Job.id).filter(Job.status == 'active')
+        for term in terms:
+            pattern = f'%{term}%'
+            like = like.filter(db.or_(Job.title.ilike(pattern), Job.company.ilike(pattern), Job.description.ilike(pattern)))
+        ids = like.order_by(Job.created_at.desc(), Job.id.desc()).limit(params['limit']).offset(params['offset']).all()
+        rows = _card_rows([(r[0], None) for r in ids], terms)
+    has_next = len(rows) > per_page
+    results = []
+    for row in rows[:per_page]:
+        item = dict(row)
+        item['snippet'] = highlight(item['snippet'])
+        results.append(item)
+    return results, has_next
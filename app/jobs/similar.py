@@ -0,0 +1,315 @@
+""""Similar jobs" from TF-IDF vectors and cosine similarity.
+
+Every active job becomes an L2-normalised TF-IDF vector over its title
+(weighted x3), company (x2) and description. Vectors are stored as an
+inverted index: one NumPy array of (row, weight) postings per term, in CSR
+layout. Scoring a job against all others is then the dot product of its
+(few dozen) strongest terms with their postings. That is one
+`np.bincount` over the concatenated postings, followed by an
+`argpartition` for the top k, and takes a few milliseconds at 50k jobs.
+
+The index lives in each worker process. The first lookup starts a
+background build and is answered by the fallback below meanwhile; it is
+also rebuilt every SIMILAR_JOBS_REFRESH seconds if set, and
+`flask jobs rebuild-similar` reports build time, size and lookup latency.
+Admin writes update it incrementally: the job's old row is marked dead
+and its new vector is appended to a small delta index; IDF weights stay
+fixed until the next rebuild.
+
+NumPy is optional. Without it, similar jobs fall back to a full-text
+search on the job's title.
+"""
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from flask import current_app
+from app.extensions import db
+from app.models import Job
+
+try:
+    import numpy as np
+except ImportError:  # optional: fall back to the search backend
+    np = None
+
+FIELD_WEIGHTS = (('title', 3.0), ('company', 2.0), ('description', 1.0))
+MAX_QUERY_TERMS = 40
+MIN_TOKEN_LENGTH = 2
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our that the their this to we will with
+you your who what which when where how all any can may not more most other such than them they these those
+""".split())
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall((text or '').lower()) if len(t) >= MIN_TOKEN_LENGTH and t not in STOPWORDS]
+
+
+def term_counts(title, company, description):
+    """Field-weighted term frequencies for one job."""
+    counts = Counter()
+    for (_, weight), text in zip(FIELD_WEIGHTS, (title, company, description)):
+        for token in tokenize(text):
+            counts[token] += weight
+    return counts
+
+
+class SimilarityIndex:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.built_at = None
+        self.generation = None   # (max updated_at, count) of the jobs table the build read
+        self.vocab = {}          # term -> column
+        self.idf = None          # float32[n_terms]
+        self.indptr = None       # int64[n_built_terms + 1], CSR over terms
+        self.rows = None         # int32[n_postings]
+        self.weights = None      # float32[n_postings]
+        self.row_job = []        # row -> job id
+        self.job_row = {}        # job id -> live row
+        self.alive = None        # bool[n_rows]
+        self.delta = {}          # term column -> ([rows], [weights]) added since the build
+        self.n_docs = 0
+        self.build_seconds = None
+
+    @property
+    def ready(self):
+        return self.built_at is not None
+
+    def build(self, batch_size=2000):
+        """Rebuild from all active jobs. Returns a stats dict."""
+        started = time.perf_counter()
+        vocab = {}
+        # Compact typed buffers: postings can run into the millions
+        doc_rows, doc_terms, doc_tf = array('i'), array('i'), array('f')
+        row_job = []
+        # Taken before the scan, so a write racing the build shows up as a newer generation
+        generation = tuple(db.session.query(db.func.max(Job.updated_at), db.func.count(Job.id)).one())
+        query = (db.session.query(Job.id, Job.title, Job.company, Job.description)
+                 .filter(Job.status == 'active').order_by(Job.id).yield_per(batch_size))
+        for job_id, title, company, description in query:
+            row = len(row_job)
+            row_job.append(job_id)
+            for term, tf in term_counts(title, company, description).items():
+                col = vocab.setdefault(term, len(vocab))
+                doc_rows.append(row)
+                doc_terms.append(col)
+                doc_tf.append(tf)
+        n_docs, n_terms = len(row_job), len(vocab)
+        rows = np.frombuffer(doc_rows, dtype=np.int32).copy()
+        terms = np.frombuffer(doc_terms, dtype=np.int32).copy()
+        del doc_rows, doc_terms
+        df = np.bincount(terms, minlength=n_terms)
+        idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+        weights = ((1.0 + np.log(np.frombuffer(doc_tf, dtype=np.float32))) * idf[terms]).astype(np.float32)
+        del doc_tf
+        norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=n_docs))
+        weights /= np.maximum(norms, 1e-12)[rows].astype(np.float32)
+        order = np.argsort(terms, kind='stable')
+        indptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df, out=indptr[1:])
+        with self._lock:
+            self.vocab, self.idf, self.indptr = vocab, idf, indptr
+            self.rows, self.weights = rows[order], weights[order]
+            self.row_job = row_job
+            self.job_row = {job_id: row for row, job_id in enumerate(row_job)}
+            self.alive = np.ones(n_docs, dtype=bool)
+            self.delta = {}
+            self.n_docs = n_docs
+            self.built_at = time.time()
+            self.generation = generation
+            self.build_seconds = time.perf_counter() - started
+        return self.stats()
+
+    def stats(self):
+        arrays = [a for a in (self.idf, self.indptr, self.rows, self.weights, self.alive) if a is not None]
+        return {
+            'jobs': len(self.job_row),
+            'terms': len(self.vocab),
+            'postings': int(self.rows.size) if self.rows is not None else 0,
+            'delta_terms': len(self.delta),
+            'bytes': int(sum(a.nbytes for a in arrays)),
+            'build_seconds': round(self.build_seconds, 3) if self.build_seconds is not None else None,
+        }
+
+    def _vector(self, title, company, description, grow=False):
+        """(columns, weights) for a document, using the built IDF weights."""
+        cols, weights = [], []
+        for term, tf in term_counts(title, company, description).items():
+            col = self.vocab.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = self.vocab[term] = len(self.vocab)
+            idf = self.idf[col] if col < len(self.idf) else math.log((1.0 + self.n_docs) / 2.0) + 1.0
+            cols.append(col)
+            weights.append((1.0 + math.log(tf)) * idf)
+        norm = math.sqrt(sum(w * w for w in weights)) or 1.0
+        return cols, [w / norm for w in weights]
+
+    def update(self, job_id, title, company, description, active=True):
+        """Replace (or drop) one job's vector without rebuilding."""
+        with self._lock:
+            old = self.job_row.pop(job_id, None)
+            if old is not None:
+                self.alive[old] = False
+            if not active:
+                return
+            cols, weights = self._vector(title, company, description, grow=True)
+            row = len(self.row_job)
+            self.row_job.append(job_id)
+            self.job_row[job_id] = row
+            self.alive = np.append(self.alive, True)
+            for col, weight in zip(cols, weights):
+                delta_rows, delta_weights = self.delta.setdefault(col, ([], []))
+                delta_rows.append(row)
+                delta_weights.append(weight)
+
+    def vector(self, title, company, description):
+        """Public (columns, weights) for a document against the current vocabulary."""
+        with self._lock:
+            return self._vector(title, company, description)
+
+    def search(self, cols, qweights, k=5, exclude=(), max_terms=MAX_QUERY_TERMS):
+        """Top-k (job_id, score) for a query vector, scoring every job in one pass.
+
+        `exclude` is a collection of job ids left out of the results; only the
+        `max_terms` strongest query terms are used.
+        """
+        if not cols:
+            return []
+        if len(cols) > max_terms:
+            keep = sorted(range(len(cols)), key=lambda i: -abs(qweights[i]))[:max_terms]
+            cols, qweights = [cols[i] for i in keep], [qweights[i] for i in keep]
+        with self._lock:
+            n_built = len(self.indptr) - 1
+            row_parts, weight_parts = [], []
+            for col, qweight in zip(cols, qweights):
+                if col < n_built:
+                    start, end = self.indptr[col], self.indptr[col + 1]
+                    row_parts.append(self.rows[start:end])
+                    weight_parts.append(self.weights[start:end] * qweight)
+                extra = self.delta.get(col)
+                if extra:
+                    row_parts.append(np.asarray(extra[0], dtype=np.int32))
+                    weight_parts.append(np.asarray(extra[1], dtype=np.float32) * qweight)
+            alive = self.alive
+            row_job = self.row_job
+            excluded_rows = [self.job_row[j] for j in exclude if j in self.job_row]
+        if not row_parts:
+            return []
+        scores = np.bincount(np.concatenate(row_parts), weights=np.concatenate(weight_parts), minlength=alive.size)
+        scores[~alive] = 0.0
+        if excluded_rows:
+            scores[excluded_rows] = 0.0
+        k = min(k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(row_job[row], float(scores[row])) for row in top if scores[row] > 0]
+
+    def similar(self, job_id, title, company, description, k=5):
+        """Top-k (job_id, score) most similar to the given job, best first."""
+        cols, qweights = self.vector(title, company, description)
+        return self.search(cols, qweights, k, exclude=(job_id,))
+
+
+similarity_index = SimilarityIndex()
+
+
+def available():
+    return np is not None
+
+
+def rebuild_similarity_index():
+    if not available():
+        return None
+    stats = similarity_index.build()
+    current_app.logger.info("similar.index_built jobs=%s terms=%s bytes=%s seconds=%s",
+                            stats['jobs'], stats['terms'], stats['bytes'], stats['build_seconds'])
+    return stats
+
+
+def invalidate_similarity():
+    """Force a rebuild on the next lookup, e.g. after a bulk import."""
+    similarity_index.built_at = None
+    similarity_index.generation = None
+
+
+def update_similarity(job_id):
+    """Refresh one job after an admin write (no-op until the index is built)."""
+    if not available() or not similarity_index.ready:
+        return
+    job = db.session.query(Job.title, Job.company, Job.description, Job.status).filter(Job.id == job_id).first()
+    if job is None:
+        similarity_index.update(job_id, None, None, None, active=False)
+    else:
+        similarity_index.update(job_id, job.title, job.company, job.description, active=job.status == 'active')
+
+
+def drop_from_similarity(job_ids):
+    """Remove jobs that stopped being active, without a query (no-op until built)."""
+    if not available() or not similarity_index.ready:
+        return
+    for job_id in job_ids:
+        similarity_index.update(job_id, None, None, None, active=False)
+
+
+_building = threading.Lock()
+
+
+def _build_in_background():
+    """Start one background build so the first request doesn't wait for it."""
+    if not _building.acquire(blocking=False):
+        return
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                rebuild_similarity_index()
+        except Exception:
+            app.logger.exception("similar.build_failed")
+        finally:
+            _building.release()
+
+    threading.Thread(target=run, name='jobsta-similar-build', daemon=True).start()
+
+
+def ensure_index():
+    """True if the index can answer now; otherwise start building it and return False."""
+    if not available():
+        return False
+    if similarity_index.ready:
+        return True
+    _build_in_background()
+    return False
+
+
+def similar_job_ids(job, k=5):
+    """Ids of up to `k` active jobs most similar to `job`, best first."""
+    if ensure_index():
+        return [job_id for job_id, _ in similarity_index.similar(job.id, job.title, job.company, job.description, k)]
+    # No index (yet): ask the search backend for jobs matching the title
+    from .search import search_jobs
+    results, _ = search_jobs(job.title, per_page=k + 1)
+    return [r['id'] for r in results if r['id'] != job.id][:k]
+
+
+def similar_jobs(job, k=5):
+    """Card-sized Job rows for `similar_job_ids`, in similarity order."""
+    from sqlalchemy.orm import load_only
+    try:
+        ids = similar_job_ids(job, k)
+    except Exception:
+        db.session.rollback()
+        current_app.logger.exception("similar.lookup_failed job_id=%s", job.id)
+        return []
+    if not ids:
+        return []
+    rows = (Job.query.options(load_only(Job.id, Job.title, Job.company, Job.location))
+            .filter(Job.id.in_(ids), Job.status == 'active').all())
+    by_id = {j.id: j for j in rows}
+    return [by_id[i] for i in ids if i in by_id]
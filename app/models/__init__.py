@@ -7,5 +7,7 @@ from .token import Token
 from .device_token import DeviceToken
 from .admin_token import AdminToken
 from .recommendation import Recommendation
+from .job_rating import JobRating
+from .broadcast import Broadcast, BroadcastCursor
 
-__all__ = ['User', 'Job', 'Application', 'Review', 'Notification', 'Token', 'DeviceToken', 'AdminToken', 'Recommendation']
\ No newline at end of file
+__all__ = ['User', 'Job', 'Application', 'Review', 'Notification', 'Token', 'DeviceToken', 'AdminToken', 'Recommendation', 'JobRating', 'Broadcast', 'BroadcastCursor']
\ No newline at end of file
@@ -4,9 +4,11 @@ from datetime import datetime
 
 
 class AdminToken(db.Model):
+    # Admin tokens are signed and stateless; a row records a revoked token id
+    # (jti) until the token would have expired anyway.
     token = db.Column(db.String(128), primary_key=True)
     created_at = db.Column(db.DateTime, default=db.func.now())
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
 
     def is_valid(self):
         return self.expires_at >= datetime.utcnow()
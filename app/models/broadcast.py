@@ -0,0 +1,26 @@
+from app.extensions import db
+
+
+class Broadcast(db.Model):
+    """A notification addressed to every user, stored once.
+
+    Users see broadcasts created after they signed up; which ones they have
+    read is tracked by their BroadcastCursor rather than per row (see
+    app.notifications.broadcasts).
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    message = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=db.func.now(), index=True)
+
+    def __repr__(self):
+        return f'<Broadcast {self.message[:20]}>'
+
+
+class BroadcastCursor(db.Model):
+    """Per-user read position in the broadcast stream: ids up to it are read."""
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    last_broadcast_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+
+    def __repr__(self):
+        return f'<BroadcastCursor {self.user_id} {self.last_broadcast_id}>'
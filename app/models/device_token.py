@@ -5,8 +5,10 @@ from datetime import datetime, timedelta
 class DeviceToken(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
+    # Public half of the cookie; NULL for legacy bcrypt-hashed tokens
+    selector = db.Column(db.String(32), unique=True, index=True, nullable=True)
     token_hash = db.Column(db.String(128), nullable=False)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=db.func.now())
 
     user = db.relationship('User', backref=db.backref('device_tokens', lazy=True))
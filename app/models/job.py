@@ -7,6 +7,8 @@ class Job(db.Model):
     company = db.Column(db.String(100), nullable=False)
     location = db.Column(db.String(100))
     salary = db.Column(db.String(50))
+    # Bucket derived from `salary` on write (see app.jobs.facets.SALARY_BANDS)
+    salary_band = db.Column(db.String(20), nullable=True)
     apply_url = db.Column(db.String(500), nullable=False)
     application_email = db.Column(db.String(254), nullable=True)
     deadline = db.Column(db.DateTime, nullable=True)
@@ -15,9 +17,25 @@ class Job(db.Model):
     created_at = db.Column(db.DateTime, default=db.func.now())
     updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
 
+    __table_args__ = (
+        # Keyset pagination of the active listing: WHERE status ORDER BY created_at, id
+        db.Index('ix_job_status_created_at_id', 'status', 'created_at', 'id'),
+        # Listing filters and facet GROUP BYs
+        db.Index('ix_job_status_location_created_at', 'status', 'location', 'created_at'),
+        db.Index('ix_job_status_company_created_at', 'status', 'company', 'created_at'),
+        db.Index('ix_job_status_salary_band_created_at', 'status', 'salary_band', 'created_at'),
+        db.Index('ix_job_status_deadline', 'status', 'deadline'),
+        # max(updated_at) is the listing's conditional-GET watermark
+        db.Index('ix_job_updated_at', 'updated_at'),
+    )
+
+    # Columns a job card needs; the listing defers everything else (notably description)
+    CARD_COLUMNS = ('id', 'title', 'company', 'location', 'salary', 'salary_band', 'deadline', 'status', 'created_at', 'updated_at')
+
     # relationships
     applications = db.relationship('Application', backref='job', lazy=True)
     reviews = db.relationship('Review', backref='job', lazy=True)
+    rating = db.relationship('JobRating', uselist=False, lazy=True, passive_deletes=True)
 
     def __repr__(self):
         return f'<Job {self.title}>'
\ No newline at end of file
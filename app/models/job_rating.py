@@ -0,0 +1,33 @@
+from app.extensions import db
+
+
+class JobRating(db.Model):
+    """Per-job review aggregate, kept in step with Review writes.
+
+    Maintained incrementally by app.reviews.ratings.record_rating in the same
+    transaction as the review itself; `flask reviews rebuild-ratings`
+    recomputes every row from the review table.
+    """
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    # Histogram of 1..5 star ratings
+    r1 = db.Column(db.Integer, nullable=False, default=0)
+    r2 = db.Column(db.Integer, nullable=False, default=0)
+    r3 = db.Column(db.Integer, nullable=False, default=0)
+    r4 = db.Column(db.Integer, nullable=False, default=0)
+    r5 = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now(), index=True)
+
+    @property
+    def average(self):
+        return round(self.total / self.count, 1) if self.count else None
+
+    @property
+    def histogram(self):
+        """[(stars, count, percent)] from 5 stars down to 1."""
+        counts = [(stars, getattr(self, f'r{stars}') or 0) for stars in range(5, 0, -1)]
+        return [(stars, n, round(100 * n / self.count) if self.count else 0) for stars, n in counts]
+
+    def __repr__(self):
+        return f'<JobRating {self.job_id} {self.count}>'
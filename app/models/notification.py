@@ -7,5 +7,10 @@ class Notification(db.Model):
     read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=db.func.now())
 
+    __table_args__ = (
+        # Unread counts, mark-all-read and the paged feed: WHERE user_id [AND read] ORDER BY created_at
+        db.Index('ix_notification_user_read_created_at', 'user_id', 'read', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<Notification {self.message[:20]}>'
\ No newline at end of file
@@ -4,7 +4,7 @@ class Token(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), nullable=False)
     token = db.Column(db.String(128), unique=True, nullable=False)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     used = db.Column(db.Boolean, default=False)
 
     def __repr__(self):
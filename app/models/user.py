@@ -10,6 +10,8 @@ class User(db.Model):
     is_verified = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=db.func.now())
     updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+    # Unread personal notifications, kept in step by every writer (see app.notifications.unread)
+    unread_notifications = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # relationships
     jobs = db.relationship('Job', backref='poster', lazy=True)
@@ -0,0 +1,58 @@
+"""Broadcast notifications, fanned out on read.
+
+A message for every user (a new job posting, an import summary) is stored
+once as a Broadcast row instead of once per user, so the notification
+tables grow with the number of postings, not postings x users. Each user
+has a BroadcastCursor holding the id of the newest broadcast they have
+seen; broadcasts up to it count as read.
+
+app.notifications.feed merges them with each user's personal
+notifications.
+"""
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models import Broadcast, BroadcastCursor, User
+from .hub import publish_after_commit, make_event
+
+
+def broadcast(message):
+    """Store one notification for every user, in the caller's transaction. Returns its id."""
+    from .unread import unread_cache
+    broadcast_id, created_at = db.session.execute(
+        db.insert(Broadcast).values(message=message).returning(Broadcast.id, Broadcast.created_at)
+    ).one()
+    # Every cached unread count just went up by one
+    unread_cache.clear()
+    publish_after_commit(None, make_event('broadcast', broadcast_id, message, created_at))
+    return broadcast_id
+
+
+def seen_broadcast_id(user_id):
+    """Scalar subquery: the user's cursor, 0 if they have none yet."""
+    return (db.select(db.func.coalesce(db.func.max(BroadcastCursor.last_broadcast_id), 0))
+            .where(BroadcastCursor.user_id == user_id).scalar_subquery())
+
+
+def visible_broadcasts(user_id):
+    """Condition for the broadcasts `user_id` gets: those created since they signed up."""
+    signed_up = db.select(User.created_at).where(User.id == user_id).scalar_subquery()
+    return Broadcast.created_at >= signed_up
+
+
+def mark_broadcasts_seen(user_id, up_to_id):
+    """Move the user's cursor forward to `up_to_id` (never back). Runs in the caller's transaction."""
+    if not up_to_id:
+        return
+    advance = (db.update(BroadcastCursor)
+               .where(BroadcastCursor.user_id == user_id, BroadcastCursor.last_broadcast_id < up_to_id)
+               .values(last_broadcast_id=up_to_id, updated_at=db.func.now()))
+    if db.session.execute(advance).rowcount:
+        return
+    if db.session.get(BroadcastCursor, user_id) is not None:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(BroadcastCursor(user_id=user_id, last_broadcast_id=up_to_id))
+    except IntegrityError:
+        # Another request created it first; advance that one instead
+        db.session.execute(advance)
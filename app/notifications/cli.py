@@ -0,0 +1,9 @@
+import click
+from .routes import bp
+
+
+@bp.cli.command('reconcile-unread')
+def reconcile_unread_command():
+    """Recompute every user's unread notification counter from the notification table."""
+    from .unread import reconcile_unread
+    click.echo(f"corrected {reconcile_unread()} users")
@@ -0,0 +1,41 @@
+"""Set-based notification fan-out.
+
+Notifications for the applicants of some jobs are written with INSERT ...
+SELECT, so the recipients never leave the database: no User or Application
+rows are loaded and no ORM objects are built, however many there are.
+Messages for every user are not fanned out at all; they are stored once as
+broadcasts (app.notifications.broadcasts).
+"""
+from app.extensions import db
+from app.models import Application, Job, Notification, User
+from .hub import publish_after_commit, make_event
+from .unread import count_new_for_applicants
+
+COLUMNS = ['user_id', 'message', 'read', 'created_at']
+
+
+def notify_applicants(job_ids, message):
+    """One notification per application to the given jobs, in the caller's transaction.
+
+    `message` is a string or a SQL expression over Job and Application
+    columns, e.g. to name each job. Applications of users that no longer
+    exist are skipped. Each row is pushed to the user's open notification
+    streams once the transaction commits. Returns rows written.
+    """
+    job_ids = list(job_ids)
+    if isinstance(message, str):
+        message = db.literal(message)
+    rows = db.session.execute(
+        db.insert(Notification).from_select(
+            COLUMNS,
+            db.select(Application.user_id, message, db.false(), db.func.now())
+            .join(User, User.id == Application.user_id)
+            .join(Job, Job.id == Application.job_id)
+            .where(Application.job_id.in_(job_ids)),
+        ).returning(Notification.id, Notification.user_id, Notification.message, Notification.created_at)
+    ).all()
+    if rows:
+        count_new_for_applicants(job_ids)
+    for row in rows:
+        publish_after_commit(row.user_id, make_event('personal', row.id, row.message, row.created_at))
+    return len(rows)
@@ -0,0 +1,75 @@
+"""A user's notification feed: personal notifications merged with broadcasts.
+
+The feed is one UNION ALL, paged with keyset cursors on (created_at, key).
+`key` ('p<id>' or 'b<id>') is unique across both kinds, so rows created in
+the same second still page deterministically.
+
+Marking read only touches unread rows. For a page, that is one UPDATE
+limited to the page's unread personal ids, plus moving the broadcast cursor.
+"Mark all read" is one UPDATE over the user's unread rows (served by
+ix_notification_user_read_created_at), plus the same cursor move. Both keep
+the unread counter in app.notifications.unread in step.
+"""
+from app.extensions import db
+from app.models import Broadcast, Notification
+from app.utils.pagination import keyset_page
+from .broadcasts import seen_broadcast_id, visible_broadcasts, mark_broadcasts_seen
+from .unread import count_read, forget
+
+
+def _key(prefix, id_col):
+    return (db.literal(prefix) + db.cast(id_col, db.String)).label('key')
+
+
+def feed(user_id):
+    """UNION ALL of the user's notifications and broadcasts, as a subquery.
+
+    Columns: kind ('personal' or 'broadcast'), id, key, message, read, created_at.
+    """
+    personal = db.select(
+        db.literal('personal').label('kind'), Notification.id.label('id'), _key('p', Notification.id),
+        Notification.message.label('message'), db.func.coalesce(Notification.read, False).label('read'),
+        Notification.created_at.label('created_at'),
+    ).where(Notification.user_id == user_id)
+    broadcasts = db.select(
+        db.literal('broadcast'), Broadcast.id, _key('b', Broadcast.id), Broadcast.message,
+        Broadcast.id <= seen_broadcast_id(user_id), Broadcast.created_at,
+    ).where(visible_broadcasts(user_id))
+    return db.union_all(personal, broadcasts).subquery('feed')
+
+
+def feed_page(user_id, cursor=None, size=20, unread_only=False):
+    """Return (rows, next_cursor) for one page of the feed, newest first."""
+    rows = feed(user_id)
+    query = db.session.query(rows)
+    if unread_only:
+        query = query.filter(db.not_(rows.c.read))
+    return keyset_page(query, rows.c.created_at, rows.c.key, cursor, size)
+
+
+def mark_read(user_id, rows):
+    """Mark the unread rows of a page as read. Returns how many changed."""
+    personal = [row.id for row in rows if row.kind == 'personal' and not row.read]
+    broadcasts = [row.id for row in rows if row.kind == 'broadcast' and not row.read]
+    if personal:
+        changed = db.session.execute(
+            db.update(Notification)
+            .where(Notification.user_id == user_id, Notification.read.isnot(True), Notification.id.in_(personal))
+            .values(read=True),
+            execution_options={'synchronize_session': False},
+        ).rowcount
+        count_read(user_id, changed)
+    if broadcasts:
+        mark_broadcasts_seen(user_id, max(broadcasts))
+        forget([user_id])
+    return len(personal) + len(broadcasts)
+
+
+def mark_all_read(user_id):
+    """Mark every notification and broadcast the user has as read."""
+    db.session.execute(
+        db.update(Notification).where(Notification.user_id == user_id, Notification.read.isnot(True)).values(read=True),
+        execution_options={'synchronize_session': False},
+    )
+    count_read(user_id)
+    mark_broadcasts_seen(user_id, db.session.query(db.func.max(Broadcast.id)).scalar())
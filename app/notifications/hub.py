@@ -0,0 +1,150 @@
+"""In-process publish/subscribe hub feeding the notification stream.
+
+Each open /notifications/stream connection subscribes with a bounded
+queue. Writers queue events on the DB session with `publish_after_commit`,
+and the events reach subscribers only once the transaction commits; a
+rollback drops them. A subscriber whose queue fills up (a stalled client)
+is not allowed to block publishers. It is marked overflowed, and its stream
+ends with a `resync` event; the browser reconnects with Last-Event-ID and
+replays what it missed from the database.
+
+Subscribers live in the worker process that serves their stream, so only
+writes made in that process are pushed live. Writes from other workers
+reach the client on its next reconnect (every SSE_MAX_SECONDS at most)
+through the same Last-Event-ID replay.
+"""
+import queue
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.utils.pagination import encode_cursor
+
+PENDING_KEY = 'notification_events'
+# Put on a subscriber's queue in place of the events it could not take
+OVERFLOW = object()
+
+
+def make_event(kind, row_id, message, created_at):
+    prefix = 'p' if kind == 'personal' else 'b'
+    return {
+        'id': encode_cursor(created_at, f'{prefix}{row_id}'),
+        'kind': kind,
+        'notification_id': row_id,
+        'message': message,
+        'created_at': created_at.isoformat() if created_at else None,
+    }
+
+
+class Subscription:
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, item):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.overflowed = True
+            # Make room for the marker so the stream wakes up and ends
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(OVERFLOW)
+            except (queue.Empty, queue.Full):
+                pass
+
+
+class NotificationHub:
+
+    def __init__(self, max_connections=50, queue_size=100):
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = {}  # user id -> set of Subscription
+        self.connections = 0
+        self.published = 0
+        self.rejected = 0
+        self.overflows = 0
+
+    def init_app(self, app):
+        max_connections = app.config.get('SSE_MAX_CONNECTIONS')
+        if max_connections is None:
+            threads = app.config.get('WEB_THREADS', 4)
+            max_connections = int(threads * app.config.get('SSE_THREAD_SHARE', 0.5))
+        self.max_connections = int(max_connections)
+        self.queue_size = int(app.config.get('SSE_QUEUE_SIZE', self.queue_size))
+        app.extensions['notification_hub'] = self
+
+    def subscribe(self, user_id):
+        """A new Subscription, or None when this worker is at SSE_MAX_CONNECTIONS."""
+        with self._lock:
+            if self.connections >= self.max_connections:
+                self.rejected += 1
+                return None
+            subscription = Subscription(user_id, self.queue_size)
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            self.connections += 1
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+            self.connections -= 1
+            if subscription.overflowed:
+                self.overflows += 1
+
+    def listening(self, user_id):
+        """Whether `user_id` has a stream open in this worker."""
+        with self._lock:
+            return user_id in self._subscribers
+
+    def publish(self, user_id, payload):
+        """Deliver to the user's open streams, or to every stream when `user_id` is None."""
+        with self._lock:
+            if user_id is None:
+                targets = [s for subscribers in self._subscribers.values() for s in subscribers]
+            else:
+                targets = list(self._subscribers.get(user_id, ()))
+            self.published += 1
+        for subscription in targets:
+            subscription.offer(payload)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'connections': self.connections,
+                'max_connections': self.max_connections,
+                'users': len(self._subscribers),
+                'published': self.published,
+                'rejected': self.rejected,
+                'overflows': self.overflows,
+            }
+
+
+notification_hub = NotificationHub()
+
+
+def publish_after_commit(user_id, payload):
+    """Queue an event for `user_id` (None: everyone) until the current transaction commits."""
+    db.session.info.setdefault(PENDING_KEY, []).append((user_id, payload))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    for user_id, payload in session.info.pop(PENDING_KEY, ()):
+        notification_hub.publish(user_id, payload)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_pending(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(PENDING_KEY, None)
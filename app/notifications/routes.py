@@ -1,3 +1,78 @@
-from flask import Blueprint
+import json
+import queue
+import time
+from flask import Blueprint, Response, current_app, request
+from app.extensions import db
+from app.utils.auth import get_current_user
+from app.utils.decorators import login_required
+from app.utils.pagination import keyset_since
+from .feed import feed
+from .hub import notification_hub, make_event, OVERFLOW
 
-bp = Blueprint('notifications', __name__)
\ No newline at end of file
+bp = Blueprint('notifications', __name__)
+
+
+def sse(payload, event='notification'):
+    """One Server-Sent Events frame."""
+    return f"id: {payload['id']}\nevent: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n"
+
+
+def missed_events(user_id, last_event_id, limit):
+    """Feed rows after the client's Last-Event-ID, oldest first."""
+    rows = feed(user_id)
+    return [make_event(row.kind, row.id, row.message, row.created_at)
+            for row in keyset_since(db.session.query(rows), rows.c.created_at, rows.c.key, last_event_id, limit)]
+
+
+def event_stream(subscription, replay, heartbeat, max_seconds, retry_ms):
+    """Yield SSE frames until the client goes away, overflows or max_seconds pass."""
+    try:
+        yield f"retry: {retry_ms}\n\n"
+        for payload in replay:
+            yield sse(payload)
+        deadline = time.monotonic() + max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                payload = subscription.queue.get(timeout=min(heartbeat, remaining))
+            except queue.Empty:
+                # Comment frame: keeps proxies from timing out and detects closed sockets
+                yield ": keepalive\n\n"
+                continue
+            if payload is OVERFLOW:
+                yield "event: resync\ndata: {}\n\n"
+                return
+            yield sse(payload)
+    finally:
+        notification_hub.unsubscribe(subscription)
+
+
+@bp.route('/notifications/stream')
+@login_required
+def stream():
+    user = get_current_user()
+    config = current_app.config
+    subscription = notification_hub.subscribe(user.id)
+    if subscription is None:
+        # 204 tells EventSource not to reconnect; the page tries again later
+        current_app.logger.info("notifications.stream_rejected user_id=%s", user.id)
+        return Response(status=204)
+    try:
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        replay = missed_events(user.id, last_event_id, config.get('SSE_REPLAY_LIMIT', 100)) if last_event_id else []
+    except Exception:
+        notification_hub.unsubscribe(subscription)
+        raise
+    finally:
+        # Don't hold a pooled DB connection for the life of the stream
+        db.session.remove()
+    response = Response(
+        event_stream(subscription, replay, config.get('SSE_HEARTBEAT_SECONDS', 15),
+                     config.get('SSE_MAX_SECONDS', 300), config.get('SSE_RETRY_SECONDS', 5) * 1000),
+        mimetype='text/event-stream',
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,89 @@
+"""Unread notification counts for the nav bar.
+
+A user's unread count has two parts:
+- personal unread notifications, kept in the denormalised
+  User.unread_notifications column by every writer;
+- broadcasts newer than the user's BroadcastCursor.
+
+The total is cached per user in UNREAD_CACHE. A page render on a hit costs
+no query, and a miss is one SELECT. Writers in this process drop the
+affected users' entries, and a broadcast drops them all. Other workers
+catch up within UNREAD_CACHE_TTL seconds. `flask notifications
+reconcile-unread` recomputes the column from the notification table if it
+ever drifts.
+"""
+from app.extensions import db
+from app.models import Application, Broadcast, Notification, User
+from app.utils.cache import TTLCache
+from .broadcasts import seen_broadcast_id, visible_broadcasts
+
+unread_cache = TTLCache('UNREAD_CACHE', maxsize=10000, ttl=60)
+
+
+def unread_count(user_id):
+    """Unread personal notifications plus unseen broadcasts for the user."""
+    count = unread_cache.get(user_id)
+    if count is None:
+        unseen = (db.select(db.func.count(Broadcast.id))
+                  .where(visible_broadcasts(user_id), Broadcast.id > seen_broadcast_id(user_id)).scalar_subquery())
+        count = db.session.execute(
+            db.select(User.unread_notifications + unseen).where(User.id == user_id)
+        ).scalar() or 0
+        unread_cache.set(user_id, count)
+    return count
+
+
+def forget(user_ids):
+    for user_id in user_ids:
+        unread_cache.pop(user_id)
+
+
+def _bump(condition, amount):
+    """Add `amount` to the counter of the users matching `condition`; returns their ids."""
+    user_ids = db.session.execute(
+        db.update(User).where(condition)
+        .values(unread_notifications=User.unread_notifications + amount).returning(User.id),
+        execution_options={'synchronize_session': False},
+    ).scalars().all()
+    forget(user_ids)
+    return user_ids
+
+
+def count_new(user_id, amount=1):
+    """Record `amount` new personal notifications for one user, in the caller's transaction."""
+    _bump(User.id == user_id, amount)
+
+
+def count_new_for_applicants(job_ids):
+    """Record one new notification per application to the given jobs, as one UPDATE."""
+    job_ids = list(job_ids)
+    per_user = (db.select(db.func.count(Application.id))
+                .where(Application.user_id == User.id, Application.job_id.in_(job_ids)).scalar_subquery())
+    applicants = db.select(Application.user_id).where(Application.job_id.in_(job_ids))
+    _bump(User.id.in_(applicants), per_user)
+
+
+def count_read(user_id, amount=None):
+    """Record `amount` personal notifications read (None: all of them)."""
+    if amount is None:
+        value = 0
+    else:
+        value = db.case((User.unread_notifications > amount, User.unread_notifications - amount), else_=0)
+    db.session.execute(
+        db.update(User).where(User.id == user_id).values(unread_notifications=value),
+        execution_options={'synchronize_session': False},
+    )
+    unread_cache.pop(user_id)
+
+
+def reconcile_unread():
+    """Recompute every user's counter from the notification table. Returns users corrected."""
+    actual = (db.select(db.func.count(Notification.id))
+              .where(Notification.user_id == User.id, Notification.read.isnot(True)).scalar_subquery())
+    fixed = db.session.execute(
+        db.update(User).where(User.unread_notifications != actual).values(unread_notifications=actual),
+        execution_options={'synchronize_session': False},
+    ).rowcount
+    db.session.commit()
+    unread_cache.clear()
+    return fixed
@@ -0,0 +1,12 @@
+import time
+import click
+from .routes import bp
+
+
+@bp.cli.command('rebuild-ratings')
+def rebuild_ratings_command():
+    """Recompute every job's rating aggregate from the review table."""
+    from .ratings import rebuild_ratings
+    started = time.perf_counter()
+    count = rebuild_ratings()
+    click.echo(f"rebuilt ratings for {count} jobs in {(time.perf_counter() - started) * 1000:.1f}ms")
@@ -0,0 +1,83 @@
+"""Per-job rating aggregates (count, sum, 1-5 histogram).
+
+`record_rating` applies the delta of one review write to the job's
+JobRating row with a single UPDATE using column arithmetic, so concurrent
+reviews of the same job never lose counts. It must be called before the
+Review row itself is added or changed and runs in the caller's transaction.
+When a job has no aggregate row yet, the row is first seeded from the
+reviews already stored for it, so jobs reviewed before the table existed
+stay correct.
+"""
+from sqlalchemy.exc import IntegrityError
+from app.extensions import db
+from app.models import JobRating, Review
+
+STARS = range(1, 6)
+
+
+def _histogram_columns():
+    return [db.func.coalesce(db.func.sum(db.case((Review.rating == stars, 1), else_=0)), 0) for stars in STARS]
+
+
+def _aggregate_select(job_filter=None):
+    """SELECT job_id, count, total, r1..r5 from reviews, grouped per job."""
+    query = db.select(
+        Review.job_id,
+        db.func.count(Review.id),
+        db.func.coalesce(db.func.sum(Review.rating), 0),
+        *_histogram_columns(),
+    ).where(Review.rating.between(1, 5))
+    if job_filter is not None:
+        query = query.where(job_filter)
+    return query.group_by(Review.job_id)
+
+
+_COLUMNS = ['job_id', 'count', 'total'] + [f'r{stars}' for stars in STARS]
+
+
+def _seed(job_id):
+    """Create the job's row from its existing reviews (or zeros) if missing."""
+    if db.session.get(JobRating, job_id) is not None:
+        return
+    row = db.session.execute(_aggregate_select(Review.job_id == job_id)).first()
+    values = dict(zip(_COLUMNS, row)) if row else dict(zip(_COLUMNS, [job_id] + [0] * (len(_COLUMNS) - 1)))
+    try:
+        with db.session.begin_nested():
+            db.session.add(JobRating(**values))
+    except IntegrityError:
+        # Another request seeded it first; the UPDATE below applies on top
+        pass
+
+
+def record_rating(job_id, new_rating, old_rating=None):
+    """Apply one review write to the aggregate: a new review, or an edit from `old_rating`."""
+    if new_rating not in STARS or (old_rating is not None and old_rating not in STARS):
+        raise ValueError('ratings must be between 1 and 5')
+    _seed(job_id)
+    changes = {
+        JobRating.total: JobRating.total + new_rating - (old_rating or 0),
+        JobRating.updated_at: db.func.now(),
+    }
+    if old_rating is None:
+        changes[JobRating.count] = JobRating.count + 1
+    if old_rating != new_rating:
+        new_col = getattr(JobRating, f'r{new_rating}')
+        changes[new_col] = new_col + 1
+        if old_rating is not None:
+            old_col = getattr(JobRating, f'r{old_rating}')
+            changes[old_col] = old_col - 1
+    db.session.execute(
+        db.update(JobRating).where(JobRating.job_id == job_id).values(changes),
+        execution_options={'synchronize_session': False},
+    )
+    rating = db.session.get(JobRating, job_id)
+    if rating is not None:
+        db.session.expire(rating)
+
+
+def rebuild_ratings():
+    """Recompute every aggregate from the review table. Returns the number of jobs rated."""
+    db.session.execute(db.delete(JobRating))
+    db.session.execute(db.insert(JobRating).from_select(_COLUMNS, _aggregate_select()))
+    db.session.commit()
+    return db.session.query(db.func.count(JobRating.job_id)).scalar()
@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
-from app.models import Job, Application, Review, Notification
+from app.models import Job, Application, Review, Notification, JobRating
 from app.models import Recommendation
 from app.utils.decorators import login_required
 from app.utils.auth import get_current_user
@@ -7,42 +7,160 @@ from app.forms import RecommendationForm
 from app.extensions import db
 from datetime import datetime, timedelta
 from flask import abort
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from app.utils.pagination import keyset_page, page_size
+from app.jobs.facets import parse_filters, apply_filters, facet_counts, SALARY_BAND_LABELS
+from app.reviews.ratings import record_rating
+from app.jobs.detail import load_job_detail, load_application_details
+from app.jobs.similar import similar_jobs, similarity_index
+from app.notifications.feed import feed_page, mark_read, mark_all_read
+from app.notifications.unread import count_new, unread_count
+from app.notifications.hub import notification_hub, make_event
+from app.jobs.ranking import dashboard_jobs, record_interaction, review_weight, APPLY_WEIGHT
+from app.utils.conditional import conditional, is_not_modified, add_validators, make_etag
+
+
+def days_left(deadline, now=None):
+    """Whole days until `deadline`, or None if there is none or it has passed."""
+    if not deadline:
+        return None
+    delta = deadline - (now or datetime.utcnow())
+    if delta.total_seconds() > 0:
+        return int(delta.total_seconds() / 86400)
+    return None
+
+
+def applied_job_ids(user_id, job_ids):
+    """Subset of `job_ids` the user has applied to, in one query per page."""
+    if not job_ids:
+        return set()
+    rows = db.session.query(Application.job_id).filter(
+        Application.user_id == user_id, Application.job_id.in_(job_ids)
+    ).all()
+    return {row[0] for row in rows}
+
+
+def _aggregates(*selects):
+    """Run several scalar aggregate selects in one round trip."""
+    return tuple(db.session.execute(db.select(*[q.scalar_subquery() for q in selects])).one())
+
+
+def _user_selects(user_id):
+    return (
+        db.select(db.func.count(Application.id)).where(Application.user_id == user_id),
+        db.select(db.func.max(Application.applied_at)).where(Application.user_id == user_id),
+        db.select(db.func.count(Review.id)).where(Review.user_id == user_id),
+        db.select(db.func.max(Review.updated_at)).where(Review.user_id == user_id),
+    )
+
+
+def _latest(values):
+    stamps = [v for v in values if isinstance(v, datetime)]
+    return max(stamps) if stamps else None
+
+
+def _user_parts(user):
+    # Everything base.html shows about the user (unread badge included), plus the day for "N days left"
+    return (user.id, user.role, user.name, user.email, unread_count(user.id), datetime.utcnow().date().isoformat())
+
+
+def listing_validator(**_):
+    """Validators for /jobs and /dashboard: all jobs plus the user's own activity."""
+    user = get_current_user()
+    values = _aggregates(
+        db.select(db.func.max(Job.updated_at)),
+        db.select(db.func.count(Job.id)),
+        db.select(db.func.max(JobRating.updated_at)),
+        *_user_selects(user.id),
+    )
+    return _user_parts(user) + values, _latest(values)
+
+
+def dashboard_validator(**_):
+    """Listing validators plus the job table state the similarity index was built from.
+
+    Unlike the build time, that generation is the same in every worker (and
+    across restarts) that built from the same data.
+    """
+    parts, last_modified = listing_validator()
+    return parts + (similarity_index.generation,), last_modified
+
+
+def job_detail_validator(job_id, **_):
+    user = get_current_user()
+    values = _aggregates(
+        db.select(Job.updated_at).where(Job.id == job_id),
+        # Any job write may change the "similar jobs" list
+        db.select(db.func.max(Job.updated_at)),
+        db.select(db.func.count(Job.id)),
+        db.select(db.func.count(Review.id)).where(Review.job_id == job_id),
+        db.select(db.func.max(Review.updated_at)).where(Review.job_id == job_id),
+        *_user_selects(user.id),
+    )
+    return _user_parts(user) + values, _latest(values)
+
+def _card_query(columns):
+    return Job.query.options(load_only(*[getattr(Job, c) for c in columns]), selectinload(Job.rating))
+
+
+def _salary_band_missing(exc):
+    """True if `exc` comes from a database without the job.salary_band column."""
+    return 'salary_band' in str(getattr(exc, 'orig', exc))
 
 bp = Blueprint('users', __name__)
 
 @bp.route('/jobs')
 @login_required
+@conditional(listing_validator)
 def jobs():
-    # Check if new columns exist, if not filter without status
+    cursor = request.args.get('cursor')
+    size = page_size('JOBS_PAGE_SIZE', max_key='JOBS_MAX_PAGE_SIZE')
+    # Only the card columns are loaded; description stays deferred
+    filters = parse_filters(request.args)
+    # Facets first: a rollback here would expire the listing's partially loaded rows
     try:
-        jobs = Job.query.filter_by(status='active').all()
-    except Exception:
-        # Fallback if status column doesn't exist yet
-        jobs = Job.query.all()
-    
-    # Calculate days until deadline for each job
+        facets = facet_counts(filters)
+    except (OperationalError, ProgrammingError) as exc:
+        if not _salary_band_missing(exc):
+            raise
+        db.session.rollback()
+        facets = None
+    try:
+        jobs, next_cursor = keyset_page(apply_filters(_card_query(Job.CARD_COLUMNS), filters),
+                                        Job.created_at, Job.id, cursor, size)
+    except (OperationalError, ProgrammingError) as exc:
+        if not _salary_band_missing(exc):
+            raise
+        # salary_band doesn't exist until its migration runs: list active jobs without that filter
+        db.session.rollback()
+        filters.pop('salary', None)
+        columns = [c for c in Job.CARD_COLUMNS if c != 'salary_band']
+        jobs, next_cursor = keyset_page(apply_filters(_card_query(columns), filters),
+                                        Job.created_at, Job.id, cursor, size)
+
+    # Calculate days until deadline once, for this page only
     now = datetime.utcnow()
     for job in jobs:
-        if hasattr(job, 'deadline') and job.deadline:
-            delta = job.deadline - now
-            if delta.total_seconds() > 0:
-                job.days_left = int(delta.total_seconds() / 86400)
-            else:
-                job.days_left = None
-        else:
-            job.days_left = None
-    return render_template('users/jobs.html', jobs=jobs, now=now)
+        job.days_left = days_left(job.deadline, now)
+    user = get_current_user()
+    return render_template('users/jobs.html', jobs=jobs, now=now, next_cursor=next_cursor, cursor=cursor,
+                           filters=filters, facets=facets, salary_labels=SALARY_BAND_LABELS,
+                           applied_ids=applied_job_ids(user.id, [j.id for j in jobs]))
 
 @bp.route('/dashboard')
 @login_required
+@conditional(dashboard_validator)
 def dashboard():
+    user = get_current_user()
     # Check if new columns exist, if not filter without status
     try:
-        jobs = Job.query.filter_by(status='active').limit(6).all()
+        jobs = dashboard_jobs(user.id, current_app.config.get('DASHBOARD_JOBS', 6))
     except Exception:
         # Fallback if status column doesn't exist yet
+        db.session.rollback()
         jobs = Job.query.limit(6).all()
-    return render_template('users/dashboard.html', jobs=jobs)
+    return render_template('users/dashboard.html', jobs=jobs, applied_ids=applied_job_ids(user.id, [j.id for j in jobs]))
 
 @bp.route('/settings')
 @login_required
@@ -67,16 +185,21 @@ def settings():
 
 @bp.route('/job/<int:job_id>')
 @login_required
+@conditional(job_detail_validator)
 def job_detail(job_id):
-    job = Job.query.get_or_404(job_id)
     user = get_current_user()
-    applied = Application.query.filter_by(user_id=user.id, job_id=job_id).first() is not None
-    reviews = Review.query.filter_by(job_id=job_id).all()
+    reviews_cursor = request.args.get('reviews_cursor')
+    # Job, rating, the user's application and review in one statement; reviews page in a second
+    detail = load_job_detail(job_id, user.id, reviews_cursor, current_app.config.get('REVIEWS_PAGE_SIZE', 10))
+    if detail is None:
+        abort(404)
+    job = detail.job
+    applied = detail.application is not None
+    reviews, next_reviews_cursor = detail.reviews, detail.next_reviews_cursor
     
     # Check if user has reviewed this job
-    user_review = None
-    if applied:
-        user_review = Review.query.filter_by(job_id=job_id, user_id=user.id).first()
+    user_review = detail.user_review if applied else None
+    similar = similar_jobs(job, current_app.config.get('SIMILAR_JOBS_COUNT', 5))
     
     # Calculate days until deadline
     days_until_deadline = None
@@ -94,7 +217,11 @@ def job_detail(job_id):
                          job=job, 
                          applied=applied, 
                          reviews=reviews,
+                         rating=detail.rating,
+                         reviews_cursor=reviews_cursor,
+                         next_reviews_cursor=next_reviews_cursor,
                          user_review=user_review,
+                         similar=similar,
                          days_until_deadline=days_until_deadline,
                          deadline_warning=deadline_warning)
 
@@ -145,9 +272,14 @@ def apply(job_id):
     # Create notification for user
     notification = Notification(user_id=user.id, message=f'You applied for {job.title} at {job.company}')
     db.session.add(notification)
+    count_new(user.id)
     
     db.session.commit()
     current_app.logger.info("users.apply recorded user_id=%s job_id=%s", user.id, job_id)
+    if notification_hub.listening(user.id):
+        notification_hub.publish(user.id, make_event('personal', notification.id, notification.message,
+                                                     notification.created_at))
+    record_interaction(user.id, job, APPLY_WEIGHT)
     
     # Send confirmation email
     apply_url = getattr(job, 'apply_url', 'https://example.com/apply')
@@ -182,11 +314,23 @@ def review(job_id):
         flash('You must apply first')
         return redirect(url_for('users.job_detail', job_id=job_id))
     
-    rating = int(request.form.get('rating', 0))
+    try:
+        rating = int(request.form.get('rating', 0))
+    except (TypeError, ValueError):
+        rating = 0
     comment = request.form.get('comment', '')
+    if rating not in range(1, 6):
+        if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return jsonify({'success': False, 'error': 'Rating must be between 1 and 5'}), 400
+        flash('Rating must be between 1 and 5')
+        return redirect(url_for('users.job_detail', job_id=job_id))
     
     # Check if user already reviewed
     existing_review = Review.query.filter_by(job_id=job_id, user_id=user.id).first()
+    # Update the job's aggregate first, in the same transaction as the review.
+    # A legacy out-of-range rating was never counted, so it is treated as new.
+    old_rating = existing_review.rating if existing_review and existing_review.rating in range(1, 6) else None
+    record_rating(job_id, rating, old_rating)
     if existing_review:
         # Update existing review
         existing_review.rating = rating
@@ -197,6 +341,7 @@ def review(job_id):
         db.session.add(review_obj)
     
     db.session.commit()
+    record_interaction(user.id, job, review_weight(rating) - review_weight(old_rating))
     
     # Handle AJAX requests
     if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -250,14 +395,23 @@ def set_application_status(application_id):
 @login_required
 def get_application_details(application_id):
     user = get_current_user()
-    application = Application.query.get_or_404(application_id)
+    # Application, job and the user's review in one statement
+    loaded = load_application_details(application_id)
+    if loaded is None:
+        abort(404)
+    application, job, user_review = loaded
     
     # Verify ownership
     if application.user_id != user.id:
         return jsonify({'error': 'Unauthorized'}), 403
-    
-    job = application.job
-    user_review = Review.query.filter_by(job_id=job.id, user_id=user.id).first()
+
+    # Validators come straight from the loaded rows
+    stamps = (application.applied_at, job.updated_at, user_review.updated_at if user_review else None)
+    etag = make_etag(request.endpoint, application.id, application.status, datetime.utcnow().date().isoformat(),
+                     *stamps)
+    last_modified = _latest(stamps)
+    if is_not_modified(etag, last_modified):
+        return add_validators(current_app.response_class(status=304), etag, last_modified)
     
     # Calculate days until deadline
     days_until_deadline = None
@@ -271,7 +425,7 @@ def get_application_details(application_id):
             elif days_until_deadline < 14:
                 deadline_warning = 'warning'
     
-    return jsonify({
+    response = jsonify({
         'job': {
             'id': job.id,
             'title': job.title,
@@ -295,15 +449,28 @@ def get_application_details(application_id):
             'comment': user_review.comment if user_review else None
         }
     })
+    return add_validators(response, etag, last_modified)
 
 @bp.route('/notifications')
 @login_required
 def notifications():
     user = get_current_user()
-    notifications = Notification.query.filter_by(user_id=user.id).order_by(Notification.created_at.desc()).all()
-    # Mark as read
-    for n in notifications:
-        if not n.read:
-            n.read = True
+    cursor = request.args.get('cursor')
+    # Personal notifications and broadcasts, merged newest first, one page at a time
+    notifications, next_cursor = feed_page(user.id, cursor, page_size('NOTIFICATIONS_PAGE_SIZE'))
+    # Mark only this page's unread rows as read
+    if mark_read(user.id, notifications):
+        db.session.commit()
+    return render_template('users/notifications.html', notifications=notifications,
+                           cursor=cursor, next_cursor=next_cursor)
+
+@bp.route('/notifications/read-all', methods=['POST'])
+@login_required
+def mark_all_notifications_read():
+    user = get_current_user()
+    mark_all_read(user.id)
     db.session.commit()
-    return render_template('users/notifications.html', notifications=notifications)
\ No newline at end of file
+    if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return jsonify({'success': True})
+    flash('All notifications marked as read')
+    return redirect(url_for('users.notifications'))
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""Stateless HMAC-signed admin tokens with an in-memory revocation set.
+
+A token is a signed payload {'jti': <random id>, 'exp': <unix seconds>}, so
+checking it needs no database round trip. Logout records the jti in the
+AdminToken table; each worker mirrors the live revocations in memory and
+re-reads the table at most every ADMIN_REVOCATION_REFRESH seconds.
+"""
+import secrets
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from itsdangerous import URLSafeSerializer, BadSignature
+from app.extensions import db
+from app.models import AdminToken
+
+_revoked = {}  # jti -> expiry (unix seconds)
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='admin-token')
+
+
+def issue_admin_token(minutes=30):
+    payload = {'jti': secrets.token_urlsafe(16), 'exp': int(time.time()) + minutes * 60}
+    return _serializer().dumps(payload)
+
+
+def decode_admin_token(token):
+    """Return the payload of a correctly signed, unexpired token, else None."""
+    try:
+        payload = _serializer().loads(token)
+    except BadSignature:
+        return None
+    if not isinstance(payload, dict) or payload.get('exp', 0) < time.time():
+        return None
+    return payload
+
+
+def _refresh_revocations(force=False):
+    global _loaded_at
+    interval = current_app.config.get('ADMIN_REVOCATION_REFRESH', 30)
+    now = time.time()
+    if not force and now - _loaded_at < interval:
+        return
+    rows = AdminToken.query.filter(AdminToken.expires_at >= datetime.utcnow()).all()
+    with _lock:
+        _revoked.clear()
+        for row in rows:
+            _revoked[row.token] = row.expires_at.timestamp()
+        _loaded_at = now
+
+
+def is_revoked(jti):
+    _refresh_revocations()
+    with _lock:
+        return jti in _revoked
+
+
+def verify_admin_token(token):
+    payload = decode_admin_token(token) if token else None
+    return payload is not None and not is_revoked(payload['jti'])
+
+
+def revoke_admin_token(token):
+    """Persist and cache the revocation of `token` until it would expire anyway."""
+    payload = decode_admin_token(token) if token else None
+    if payload is None:
+        return
+    with _lock:
+        _revoked[payload['jti']] = payload['exp']
+    if not db.session.get(AdminToken, payload['jti']):
+        db.session.add(AdminToken(token=payload['jti'], expires_at=datetime.utcfromtimestamp(payload['exp'])))
+    db.session.commit()
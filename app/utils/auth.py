@@ -1,24 +1,192 @@
-from flask import request
+from flask import request, current_app, g
 from app.models import User, DeviceToken
-from app.extensions import bcrypt
-from datetime import datetime
+from app.extensions import db, session_cache
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session, object_session
+from datetime import datetime, timedelta
+import hashlib
+import hmac
+import secrets
+
+# Device token cookie format: "<selector>.<verifier>". The selector is stored
+# in clear (indexed) to locate the row; only a SHA-256 digest of the verifier
+# is stored, so a single lookup plus one constant-time compare authenticates.
+DEVICE_COOKIE = 'device_token'
+DEVICE_TOKEN_DAYS = 7
+TOKEN_SEPARATOR = '.'
+STALE_SESSIONS_KEY = 'stale_user_sessions'
+
+
+def _digest(verifier):
+    return hashlib.sha256(verifier.encode('utf-8')).hexdigest()
+
+
+def split_device_token(token):
+    """Return (selector, verifier) or (None, None) for legacy/malformed values."""
+    if not token or TOKEN_SEPARATOR not in token:
+        return None, None
+    selector, _, verifier = token.partition(TOKEN_SEPARATOR)
+    if not selector or not verifier:
+        return None, None
+    return selector, verifier
+
+
+def issue_device_token(user, days=DEVICE_TOKEN_DAYS):
+    """Create a DeviceToken row for `user` and return the cookie value.
+
+    The row is added to the session but not committed. Legacy (selector-less)
+    bcrypt tokens of this user are removed so they migrate to the new format.
+    """
+    DeviceToken.query.filter(
+        DeviceToken.user_id == user.id,
+        DeviceToken.selector.is_(None)
+    ).delete(synchronize_session=False)
+    selector = secrets.token_urlsafe(12)
+    verifier = secrets.token_urlsafe(32)
+    expires = datetime.utcnow() + timedelta(days=days)
+    device = DeviceToken(user_id=user.id, selector=selector, token_hash=_digest(verifier), expires_at=expires)
+    db.session.add(device)
+    return f'{selector}{TOKEN_SEPARATOR}{verifier}'
+
+
+def set_device_cookie(response, token, days=DEVICE_TOKEN_DAYS):
+    response.set_cookie(DEVICE_COOKIE, token, httponly=True, secure=current_app.config.get('COOKIE_SECURE', False), samesite='Lax', max_age=days*24*3600)
+    return response
+
+
+def find_device_token(token):
+    """Resolve a cookie value to its live DeviceToken row, or None."""
+    selector, verifier = split_device_token(token)
+    if not selector:
+        return None
+    dt = DeviceToken.query.filter_by(selector=selector).first()
+    if not dt or dt.expires_at < datetime.utcnow():
+        return None
+    if not hmac.compare_digest(dt.token_hash, _digest(verifier)):
+        return None
+    return dt
+
+
+class SessionUser:
+    """Compact, cacheable view of the authenticated User.
+
+    Only the fields in SNAPSHOT_FIELDS are held; any other attribute (read or
+    write) is forwarded to the full User row, which is loaded lazily once.
+    """
+
+    SNAPSHOT_FIELDS = ('id', 'role', 'is_verified', 'name', 'email')
+
+    def __init__(self, snapshot, model=None):
+        for name, value in zip(self.SNAPSHOT_FIELDS, snapshot):
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, '_model', model)
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(tuple(getattr(user, name) for name in cls.SNAPSHOT_FIELDS), model=user)
+
+    @property
+    def model(self):
+        if self._model is None:
+            object.__setattr__(self, '_model', User.query.get(self.id))
+        return self._model
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def __setattr__(self, name, value):
+        setattr(self.model, name, value)
+        if name in self.SNAPSHOT_FIELDS:
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f'<SessionUser {self.email}>'
+
+
+def session_cache_key(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _resolve_current_user():
+    token = request.cookies.get(DEVICE_COOKIE)
+    if not token:
+        return None
+    key = session_cache_key(token)
+    snapshot = session_cache.get(key)
+    if snapshot is not None:
+        return SessionUser(snapshot)
+    dt = find_device_token(token)
+    if not dt:
+        return None
+    user = User.query.get(dt.user_id)
+    if not user:
+        return None
+    current = SessionUser.from_user(user)
+    # Never cache past the token's own expiry
+    remaining = (dt.expires_at - datetime.utcnow()).total_seconds()
+    session_cache.set(key, tuple(getattr(current, f) for f in SessionUser.SNAPSHOT_FIELDS),
+                      ttl=min(session_cache.ttl, remaining), tag=user.id)
+    return current
+
+
+def invalidate_session(token):
+    """Drop the cached session for a single device token cookie value."""
+    if token:
+        session_cache.pop(session_cache_key(token))
+
+
+def invalidate_user_sessions(user_id):
+    """Drop every cached session belonging to `user_id`."""
+    session_cache.invalidate_tag(user_id)
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    # Role, verification or profile changes must not be served from stale snapshots.
+    # Invalidate only once the change is committed: dropping the entry at flush
+    # time lets a concurrent request re-cache the old row before the commit.
+    state = sa_inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in SessionUser.SNAPSHOT_FIELDS):
+        object_session(target).info.setdefault(STALE_SESSIONS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_stale_sessions(session):
+    for user_id in session.info.pop(STALE_SESSIONS_KEY, ()):
+        invalidate_user_sessions(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _drop_stale_sessions(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(STALE_SESSIONS_KEY, None)
+
 
 def get_current_user():
+    """Return the authenticated User, resolving it at most once per request.
+
+    The result is memoized on `flask.g`; `g.auth_resolutions` counts how many
+    times the cookie was actually resolved during the request.
+    """
     try:
-        token = request.cookies.get('device_token')
+        request.cookies
     except RuntimeError:
         # No request context (e.g., during template rendering outside request)
         return None
-    if not token:
+    if '_current_user' in g:
+        return g._current_user
+    user = _resolve_current_user()
+    g._current_user = user
+    g.auth_resolutions = g.get('auth_resolutions', 0) + 1
+    return user
+
+
+def peek_current_user():
+    """Return the user if already resolved in this request, without resolving it."""
+    try:
+        return g.get('_current_user')
+    except RuntimeError:
         return None
-    # Find any non-expired device tokens for which the hashed value matches
-    now = datetime.utcnow()
-    candidates = DeviceToken.query.filter(DeviceToken.expires_at >= now).all()
-    for dt in candidates:
-        try:
-            if bcrypt.check_password_hash(dt.token_hash, token):
-                return User.query.get(dt.user_id)
-        except Exception:
-            # If hashing/check fails, continue to next
-            continue
-    return None
\ No newline at end of file
+
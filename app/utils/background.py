@@ -0,0 +1,27 @@
+"""Opt-in periodic background tasks running inside the web worker."""
+import threading
+
+
+def start_periodic(app, name, interval, func):
+    """Run `func()` inside an app context every `interval` seconds.
+
+    Does nothing when `interval` is falsy. Returns the daemon thread (or None).
+    Every worker process runs its own copy, so tasks must be idempotent.
+    """
+    if not interval or interval <= 0:
+        return None
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    func()
+                except Exception:
+                    app.logger.exception("background.%s failed", name)
+
+    thread = threading.Thread(target=loop, name=f'jobsta-{name}', daemon=True)
+    thread.stop = stop
+    thread.start()
+    app.logger.info("background.%s started interval=%ss", name, interval)
+    return thread
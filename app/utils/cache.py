@@ -0,0 +1,112 @@
+"""Small in-process LRU + TTL cache with tag invalidation and hit/miss stats."""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    Entries may carry a `tag` (e.g. a user id) so every entry for that tag can
+    be dropped at once. With `maxbytes`, entries also carry a size and the
+    least recently used ones are evicted once the total exceeds it. Size, TTL
+    and byte budget are read from `<PREFIX>_SIZE`, `<PREFIX>_TTL` and
+    `<PREFIX>_BYTES` in the app config by `init_app`.
+    """
+
+    def __init__(self, config_prefix, maxsize=1024, ttl=60, maxbytes=None):
+        self.config_prefix = config_prefix
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self._data = OrderedDict()  # key -> (value, expires_at, tag, size)
+        self._tags = {}             # tag -> set(keys)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.maxsize = int(app.config.get(f'{self.config_prefix}_SIZE', self.maxsize))
+        self.ttl = float(app.config.get(f'{self.config_prefix}_TTL', self.ttl))
+        self.maxbytes = app.config.get(f'{self.config_prefix}_BYTES', self.maxbytes)
+        app.extensions.setdefault('caches', {})[self.config_prefix.lower()] = self
+
+    def _drop(self, key):
+        value, _, tag, size = self._data.pop(key)
+        self.nbytes -= size
+        if tag is not None:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, ttl=None, tag=None, size=0):
+        if self.maxsize <= 0 or (self.maxbytes is not None and size > self.maxbytes):
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, expires_at, tag, size)
+            self.nbytes += size
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self.nbytes > self.maxbytes):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidate_tag(self, tag):
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._drop(key)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._tags.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'bytes': self.nbytes,
+                'maxbytes': self.maxbytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,99 @@
+"""Conditional GET (weak ETag / Last-Modified / 304) for authenticated pages.
+
+A view decorated with `@conditional(validator)` first calls `validator` with
+the view arguments. The validator returns `(etag_parts, last_modified)` from
+cheap aggregate queries, or None to skip conditional handling. When the
+client's If-None-Match / If-Modified-Since still matches, a 304 is returned
+without running the view. Otherwise the view runs and its 200 response gets
+the validators attached.
+
+Pages are per user, so responses are marked `private, no-cache`: browsers may
+keep them but must revalidate on every use, and shared caches must not store
+them. ETags are salted with ETAG_SALT (on Render, the deployed commit), so
+every worker of one deploy agrees on them and a new deploy (new templates)
+invalidates everything. Without a salt, the newest template mtime is used.
+"""
+import hashlib
+import os
+from datetime import timezone
+from functools import wraps
+from flask import current_app, make_response, request, session
+from app.extensions import db
+
+_salt = None
+
+
+def _etag_salt():
+    global _salt
+    if _salt is None:
+        salt = current_app.config.get('ETAG_SALT')
+        if not salt:
+            newest = 0
+            for root in getattr(current_app.jinja_loader, 'searchpath', ()):
+                for dirpath, _, filenames in os.walk(root):
+                    for name in filenames:
+                        newest = max(newest, os.path.getmtime(os.path.join(dirpath, name)))
+            salt = f'templates-{int(newest)}'
+        _salt = salt
+    return _salt
+
+
+def make_etag(*parts):
+    raw = repr((_etag_salt(),) + parts).encode('utf-8')
+    return hashlib.sha1(raw).hexdigest()[:32]
+
+
+def _http_date(value):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def is_not_modified(etag, last_modified=None):
+    """Evaluate the request's preconditions; If-None-Match wins when present."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    last_modified = _http_date(last_modified)
+    if since is not None and last_modified is not None:
+        return last_modified <= since
+    return False
+
+
+def add_validators(response, etag, last_modified=None):
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Cookie')
+    return response
+
+
+def conditional(validator):
+    """Decorator answering 304 when `validator(**view_args)` is unchanged."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            # Pending flashes would be lost on a 304, so render those normally
+            if request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+                return view(*args, **kwargs)
+            try:
+                validators = validator(*args, **kwargs)
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.warning("conditional.validator_failed endpoint=%s error=%s", request.endpoint, e)
+                validators = None
+            if validators is None:
+                return view(*args, **kwargs)
+            parts, last_modified = validators
+            etag = make_etag(request.endpoint, *parts)
+            if is_not_modified(etag, last_modified):
+                return add_validators(current_app.response_class(status=304), etag, last_modified)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                add_validators(response, etag, last_modified)
+            return response
+        return wrapped
+    return decorator
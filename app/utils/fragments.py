@@ -0,0 +1,70 @@
+"""Cached rendering of job cards.
+
+Each card variant is a small partial template. Its HTML is cached per
+(variant, job.id, job.updated_at) plus the job's review aggregate for the
+variants that show it, so an edit or a new review produces a new key;
+the old entries of an updated or deleted job are also dropped eagerly.
+Anything per-user (e.g. the "Applied" badge) must be rendered by the calling
+template outside the cached fragment.
+"""
+import time
+from flask import current_app
+from markupsafe import Markup
+from sqlalchemy import event
+from app.models import Job
+from app.utils.cache import TTLCache
+
+CARD_TEMPLATES = {
+    'listing': 'users/_job_card.html',
+    'dashboard': 'users/_dashboard_job_card.html',
+    'admin': 'admin/_job_card.html',
+}
+# Variants that show the review aggregate, which changes without touching the job
+RATED_VARIANTS = {'listing', 'dashboard'}
+
+
+class FragmentCache(TTLCache):
+    """TTLCache that also reports how long the misses took to render."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.renders = 0
+        self.render_ms = 0.0
+
+    def stats(self):
+        stats = super().stats()
+        stats['avg_miss_render_ms'] = round(self.render_ms / self.renders, 3) if self.renders else None
+        return stats
+
+
+fragment_cache = FragmentCache('FRAGMENT_CACHE', maxsize=10000, ttl=3600, maxbytes=8 * 1024 * 1024)
+
+
+def _rating_key(job):
+    rating = job.rating
+    return (rating.count, rating.total) if rating is not None else None
+
+
+def job_card(variant, job):
+    """Return the rendered card for `job` in the given variant (Jinja global)."""
+    key = (variant, job.id, job.updated_at, _rating_key(job) if variant in RATED_VARIANTS else None)
+    html = fragment_cache.get(key)
+    if html is None:
+        started = time.perf_counter()
+        template = current_app.jinja_env.get_template(CARD_TEMPLATES[variant])
+        html = Markup(template.render(job=job))
+        fragment_cache.renders += 1
+        fragment_cache.render_ms += (time.perf_counter() - started) * 1000
+        fragment_cache.set(key, html, tag=job.id, size=len(html))
+    return html
+
+
+@event.listens_for(Job, 'after_update')
+@event.listens_for(Job, 'after_delete')
+def _drop_job_fragments(mapper, connection, target):
+    fragment_cache.invalidate_tag(target.id)
+
+
+def init_app(app):
+    fragment_cache.init_app(app)
+    app.add_template_global(job_card)
@@ -0,0 +1,90 @@
+"""Keyset (cursor) pagination over (timestamp, id) orderings.
+
+Pages are fetched with `WHERE (ts, id) < (cursor_ts, cursor_id) ORDER BY ts
+DESC, id DESC LIMIT n`, which uses a composite index and costs the same on
+page 1 and page 1000, unlike OFFSET.
+"""
+import base64
+from datetime import datetime
+from flask import current_app, request
+from app.extensions import db
+
+
+def encode_cursor(ts, row_id):
+    raw = f'{ts.isoformat() if ts else ""}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (datetime, id) for a cursor string, or None if it is malformed."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        ts_raw, _, id_raw = base64.urlsafe_b64decode(padded).decode('utf-8').partition('|')
+        ts = datetime.fromisoformat(ts_raw) if ts_raw else None
+        row_id = int(id_raw) if id_raw.isdigit() else id_raw
+        return ts, row_id
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def page_size(config_key, default=20, max_key=None):
+    """Page size from ?per_page=, bounded by config (`<config_key>` / max)."""
+    size = current_app.config.get(config_key, default)
+    max_size = current_app.config.get(max_key, size * 4) if max_key else size * 4
+    try:
+        size = int(request.args.get('per_page', size))
+    except (TypeError, ValueError):
+        pass
+    return max(1, min(size, max_size))
+
+
+def _sortable(ts_col, ts=None):
+    """(column expression, cursor bound) that compare correctly on this database.
+
+    SQLite keeps datetimes as text in two shapes: CURRENT_TIMESTAMP defaults
+    as 'YYYY-MM-DD HH:MM:SS', values written from Python as
+    '... HH:MM:SS.ffffff'. Compared as text, a row and a cursor for the same
+    second disagree, so there both sides (and the ORDER BY, so the two agree)
+    go through one strftime() format. Other databases compare native
+    timestamps and keep the plain, index-ordered column.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return ts_col, ts
+    fmt = '%Y-%m-%d %H:%M:%f'
+    bound = db.func.strftime(fmt, db.literal(ts.isoformat(' '), db.String)) if ts is not None else None
+    return db.func.strftime(fmt, ts_col), bound
+
+
+def keyset_page(query, ts_col, id_col, cursor=None, size=20):
+    """Return (items, next_cursor) for the page after `cursor`, newest first."""
+    after = decode_cursor(cursor)
+    ts, row_id = after if after is not None else (None, None)
+    sort_col, ts = _sortable(ts_col, ts)
+    if after is not None:
+        query = query.filter(db.or_(
+            sort_col < ts,
+            db.and_(sort_col == ts, id_col < row_id)
+        ))
+    rows = query.order_by(sort_col.desc(), id_col.desc()).limit(size + 1).all()
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, ts_col.key), getattr(last, id_col.key))
+    return rows, next_cursor
+
+
+def keyset_since(query, ts_col, id_col, cursor, size=100):
+    """Rows newer than `cursor`, oldest first (e.g. to replay missed events)."""
+    after = decode_cursor(cursor)
+    if after is None:
+        return []
+    ts, row_id = after
+    sort_col, ts = _sortable(ts_col, ts)
+    query = query.filter(db.or_(
+        sort_col > ts,
+        db.and_(sort_col == ts, id_col > row_id)
+    ))
+    return query.order_by(sort_col, id_col).limit(size).all()
@@ -0,0 +1,124 @@
+"""Password hashing off the request thread, with bcrypt cost calibration.
+
+bcrypt is deliberately slow; running it inline on a waitress worker thread
+lets a burst of logins starve page rendering. All hashing/checking goes
+through a small bounded thread pool instead, so at most
+PASSWORD_HASH_WORKERS bcrypt computations run at once per process.
+
+Admission is bounded too: at most PASSWORD_HASH_QUEUE more hashes may wait
+for a pool thread. A request that cannot get a slot within
+PASSWORD_HASH_ACQUIRE_TIMEOUT seconds, or whose hash is not done within
+PASSWORD_HASH_TIMEOUT, raises PasswordPoolBusy. The app answers that with
+503 and Retry-After instead of holding a request thread in the queue.
+"""
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app, request, jsonify, make_response
+from app.extensions import bcrypt
+
+MIN_COST = 10
+MAX_COST = 15
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+class PasswordPoolBusy(Exception):
+    """The hashing pool is saturated; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__('password hashing pool is busy')
+        self.retry_after = retry_after
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = current_app.config.get('PASSWORD_HASH_WORKERS') or min(4, os.cpu_count() or 1)
+                queued = current_app.config.get('PASSWORD_HASH_QUEUE')
+                _slots = threading.BoundedSemaphore(workers + (workers if queued is None else queued))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jobsta-bcrypt')
+    return _executor
+
+
+def _run(func, *args):
+    """Run `func` on the pool, or raise PasswordPoolBusy if it is saturated."""
+    executor = _get_executor()
+    config = current_app.config
+    retry_after = config.get('PASSWORD_HASH_RETRY_AFTER', 2)
+    if not _slots.acquire(timeout=config.get('PASSWORD_HASH_ACQUIRE_TIMEOUT', 0.5)):
+        current_app.logger.warning("passwords.pool_busy reason=admission")
+        raise PasswordPoolBusy(retry_after)
+    try:
+        future = executor.submit(func, *args)
+    except Exception:
+        _slots.release()
+        raise
+    # The slot is held until the hash finishes, even if this request gives up on it
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=config.get('PASSWORD_HASH_TIMEOUT', 5))
+    except FutureTimeout:
+        current_app.logger.warning("passwords.pool_busy reason=timeout")
+        raise PasswordPoolBusy(retry_after) from None
+
+
+def pool_busy_response(error):
+    """Error handler for PasswordPoolBusy: 503 with Retry-After."""
+    if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        resp = make_response(jsonify({'success': False, 'error': 'Server busy'}), 503)
+    else:
+        resp = make_response('The server is busy. Please try again in a moment.', 503)
+    resp.headers['Retry-After'] = str(max(1, math.ceil(error.retry_after)))
+    return resp
+
+
+def current_cost():
+    return int(current_app.config.get('BCRYPT_LOG_ROUNDS', 12))
+
+
+def hash_password(password):
+    """Return a bcrypt hash (str) of `password` at the configured cost."""
+    return _run(bcrypt.generate_password_hash, password, current_cost()).decode('utf-8')
+
+
+def check_password(pw_hash, password):
+    """Constant-time bcrypt check of `password` against `pw_hash`."""
+    if not pw_hash or not password:
+        return False
+    return _run(bcrypt.check_password_hash, pw_hash, password)
+
+
+def hash_cost(pw_hash):
+    """Extract the cost factor from a '$2b$12$...' hash, or None."""
+    try:
+        return int(pw_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def needs_rehash(pw_hash):
+    """True if `pw_hash` was made at a lower cost than currently configured."""
+    cost = hash_cost(pw_hash)
+    return cost is not None and cost < current_cost()
+
+
+def calibrate_cost(target_ms=250, min_cost=MIN_COST, max_cost=MAX_COST):
+    """Pick the highest bcrypt cost whose hash time stays within `target_ms`.
+
+    Each cost step doubles the work, so one measurement at `min_cost` is
+    extrapolated. Returns (cost, measured_ms_at_min_cost).
+    """
+    started = time.perf_counter()
+    bcrypt.generate_password_hash('calibration-password', min_cost)
+    base_ms = (time.perf_counter() - started) * 1000
+    cost = min_cost
+    while cost < max_cost and base_ms * (2 ** (cost + 1 - min_cost)) <= target_ms:
+        cost += 1
+    return cost, base_ms
@@ -0,0 +1,18 @@
+"""Client address as seen through our reverse proxy."""
+from flask import current_app, request
+
+
+def client_ip():
+    """Best-effort client address.
+
+    Render's proxy appends the real peer to X-Forwarded-For, so the entry
+    TRUSTED_PROXIES positions from the right is the one we trust; anything
+    further left is client supplied.
+    """
+    forwarded = request.headers.get('X-Forwarded-For')
+    trusted = current_app.config.get('TRUSTED_PROXIES', 1)
+    if forwarded and trusted:
+        parts = [p.strip() for p in forwarded.split(',') if p.strip()]
+        if parts:
+            return parts[-min(trusted, len(parts))]
+    return request.remote_addr or '-'
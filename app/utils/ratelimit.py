@@ -0,0 +1,147 @@
+"""Sliding-window rate limiting for selected blueprint endpoints.
+
+Limits are configured per endpoint in RATELIMITS as a list of
+(scope, max_hits, window_seconds), where scope is one of:
+
+- 'ip':    the client address (see app.utils.proxy.client_ip)
+- 'user':  the authenticated user id (skipped for anonymous requests)
+- 'email': the submitted `email` form field (e.g. login targets)
+
+Counters live in-process by default. Set RATELIMIT_STORAGE to
+'sqlite:///path/to/file.db' to share them between workers on one host.
+Requests over a limit get 429 with a Retry-After header.
+"""
+import math
+import sqlite3
+import threading
+import time
+from collections import deque
+from flask import request, jsonify, make_response, current_app
+from app.utils.proxy import client_ip
+
+
+class MemoryStore:
+    """Per-process sliding-window log."""
+
+    def __init__(self):
+        self._hits = {}  # key -> deque of timestamps
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        with self._lock:
+            log = self._hits.setdefault(key, deque())
+            while log and log[0] <= now - window:
+                log.popleft()
+            if len(log) >= limit:
+                return False, log[0] + window - now
+            log.append(now)
+            self._calls += 1
+            if self._calls % 1000 == 0:
+                self._sweep(now)
+            return True, 0
+
+    def _sweep(self, now, horizon=3600):
+        for key in [k for k, log in self._hits.items() if not log or log[-1] <= now - horizon]:
+            del self._hits[key]
+
+
+class SQLiteStore:
+    """Sliding-window log in a SQLite file shared by workers on one host."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        conn = self._conn()
+        conn.execute('CREATE TABLE IF NOT EXISTS ratelimit_hit (key TEXT NOT NULL, ts REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_ratelimit_hit_key_ts ON ratelimit_hit (key, ts)')
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, limit, window):
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM ratelimit_hit WHERE key = ? AND ts <= ?', (key, now - window))
+            count, oldest = conn.execute(
+                'SELECT COUNT(*), MIN(ts) FROM ratelimit_hit WHERE key = ?', (key,)
+            ).fetchone()
+            if count >= limit:
+                conn.execute('COMMIT')
+                return False, oldest + window - now
+            conn.execute('INSERT INTO ratelimit_hit (key, ts) VALUES (?, ?)', (key, now))
+            self._calls += 1
+            if self._calls % 1000 == 0:
+                conn.execute('DELETE FROM ratelimit_hit WHERE ts <= ?', (now - 3600,))
+            conn.execute('COMMIT')
+            return True, 0
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+
+class RateLimiter:
+
+    def __init__(self):
+        self.store = None
+        self.limits = {}
+        self.methods = ('POST',)
+        self.blocked = 0
+
+    def init_app(self, app):
+        if not app.config.get('RATELIMIT_ENABLED', True):
+            return
+        storage = app.config.get('RATELIMIT_STORAGE') or 'memory'
+        if storage.startswith('sqlite:///'):
+            self.store = SQLiteStore(storage[len('sqlite:///'):])
+        else:
+            self.store = MemoryStore()
+        self.limits = dict(app.config.get('RATELIMITS') or {})
+        self.methods = tuple(app.config.get('RATELIMIT_METHODS') or ('POST',))
+        app.before_request(self._check)
+
+    def _scope_value(self, scope):
+        if scope == 'ip':
+            return client_ip()
+        if scope == 'user':
+            from app.utils.auth import get_current_user
+            user = get_current_user()
+            return user.id if user else None
+        if scope == 'email':
+            email = request.form.get('email')
+            return email.strip().lower() if email else None
+        return None
+
+    def _check(self):
+        rules = self.limits.get(request.endpoint)
+        if not rules or request.method not in self.methods:
+            return None
+        for scope, limit, window in rules:
+            value = self._scope_value(scope)
+            if value is None:
+                continue
+            allowed, retry_after = self.store.hit(f'{request.endpoint}:{scope}:{value}', limit, window)
+            if not allowed:
+                self.blocked += 1
+                current_app.logger.warning(
+                    "ratelimit.blocked endpoint=%s scope=%s limit=%s/%ss", request.endpoint, scope, limit, window
+                )
+                return self._too_many(retry_after)
+        return None
+
+    def _too_many(self, retry_after):
+        if request.is_json or request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            resp = make_response(jsonify({'success': False, 'error': 'Too many requests'}), 429)
+        else:
+            resp = make_response('Too many requests. Please try again shortly.', 429)
+        resp.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return resp
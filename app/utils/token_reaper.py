@@ -0,0 +1,50 @@
+"""Batched deletion of expired/used rows from the token tables."""
+import time
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models import DeviceToken, Token, AdminToken
+
+
+def _reapable(now):
+    # (label, primary key column, condition)
+    return [
+        ('device_token', DeviceToken.id, DeviceToken.expires_at < now),
+        ('token', Token.id, db.or_(Token.expires_at < now, Token.used.is_(True))),
+        ('admin_token', AdminToken.token, AdminToken.expires_at < now),
+    ]
+
+
+def reap_expired_tokens(batch_size=500, max_batches=None):
+    """Delete expired (and used magic-link) tokens in bounded batches.
+
+    Each batch selects at most `batch_size` primary keys and deletes them in a
+    short transaction, so the tables are never locked for long. Returns a dict
+    of table -> {'deleted': n, 'batches': n, 'duration_ms': x}.
+    """
+    now = datetime.utcnow()
+    report = {}
+    for label, pk, condition in _reapable(now):
+        deleted = batches = 0
+        started = time.perf_counter()
+        while max_batches is None or batches < max_batches:
+            batch_started = time.perf_counter()
+            ids = [row[0] for row in db.session.query(pk).filter(condition).limit(batch_size).all()]
+            if not ids:
+                break
+            count = db.session.query(pk.class_).filter(pk.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            batches += 1
+            deleted += count
+            current_app.logger.info(
+                "tokens.reap table=%s batch=%s deleted=%s duration_ms=%.1f",
+                label, batches, count, (time.perf_counter() - batch_started) * 1000
+            )
+            if len(ids) < batch_size:
+                break
+        report[label] = {
+            'deleted': deleted,
+            'batches': batches,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+        }
+    return report
@@ -0,0 +1,53 @@
+"""Add job.salary_band and the facet indexes
+
+Bands for existing jobs are computed here with the same parser writers use
+(app.jobs.facets.salary_band); '' marks an unparseable salary.
+
+Revision ID: 002ba8c75fb8
+Revises: 9382291392d4
+Create Date: 2026-10-17 14:04:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002ba8c75fb8'
+down_revision = '9382291392d4'
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    'ix_job_status_location_created_at': ['status', 'location', 'created_at'],
+    'ix_job_status_company_created_at': ['status', 'company', 'created_at'],
+    'ix_job_status_salary_band_created_at': ['status', 'salary_band', 'created_at'],
+}
+
+
+def upgrade():
+    from app.jobs.facets import salary_band
+
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if 'salary_band' not in {c['name'] for c in inspector.get_columns('job')}:
+        op.add_column('job', sa.Column('salary_band', sa.String(length=20), nullable=True))
+    existing = {i['name'] for i in inspector.get_indexes('job')}
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'job', columns)
+
+    job = sa.table('job', sa.column('id', sa.Integer), sa.column('salary', sa.String),
+                   sa.column('salary_band', sa.String))
+    rows = bind.execute(sa.select(job.c.id, job.c.salary).where(job.c.salary_band.is_(None))).all()
+    if rows:
+        bind.execute(
+            job.update().where(job.c.id == sa.bindparam('job_id')).values(salary_band=sa.bindparam('band')),
+            [{'job_id': job_id, 'band': salary_band(salary) or ''} for job_id, salary in rows],
+        )
+
+
+def downgrade():
+    for name in INDEXES:
+        op.drop_index(name, table_name='job')
+    op.drop_column('job', 'salary_band')
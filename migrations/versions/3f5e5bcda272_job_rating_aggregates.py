@@ -0,0 +1,62 @@
+"""Add job_rating and fill it from existing reviews
+
+Jobs reviewed before this revision get their aggregate row here, so they
+don't show zero ratings until their next review. Jobs that already have a
+row (written since db.create_all() made the table) are left alone.
+
+Revision ID: 3f5e5bcda272
+Revises: de5c252bbf1d
+Create Date: 2026-10-17 14:06:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f5e5bcda272'
+down_revision = 'de5c252bbf1d'
+branch_labels = None
+depends_on = None
+
+STARS = range(1, 6)
+
+
+def upgrade():
+    if 'job_rating' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            'job_rating',
+            sa.Column('job_id', sa.Integer(), sa.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            *[sa.Column(f'r{stars}', sa.Integer(), nullable=False) for stars in STARS],
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_job_rating_updated_at', 'job_rating', ['updated_at'])
+
+    review = sa.table('review', sa.column('id', sa.Integer), sa.column('job_id', sa.Integer),
+                      sa.column('rating', sa.Integer))
+    job = sa.table('job', sa.column('id', sa.Integer))
+    job_rating = sa.table('job_rating', sa.column('job_id', sa.Integer), sa.column('count', sa.Integer),
+                          sa.column('total', sa.Integer), *[sa.column(f'r{stars}', sa.Integer) for stars in STARS],
+                          sa.column('updated_at', sa.DateTime))
+    aggregates = (
+        sa.select(
+            review.c.job_id,
+            sa.func.count(review.c.id),
+            sa.func.coalesce(sa.func.sum(review.c.rating), 0),
+            *[sa.func.coalesce(sa.func.sum(sa.case((review.c.rating == stars, 1), else_=0)), 0) for stars in STARS],
+            sa.func.now(),
+        )
+        .join(job, job.c.id == review.c.job_id)
+        .where(review.c.rating.between(1, 5),
+               ~sa.exists().where(job_rating.c.job_id == review.c.job_id))
+        .group_by(review.c.job_id)
+    )
+    columns = ['job_id', 'count', 'total'] + [f'r{stars}' for stars in STARS] + ['updated_at']
+    op.execute(job_rating.insert().from_select(columns, aggregates))
+
+
+def downgrade():
+    op.drop_index('ix_job_rating_updated_at', table_name='job_rating')
+    op.drop_table('job_rating')
@@ -0,0 +1,32 @@
+"""Add user.unread_notifications and fill it from notification
+
+Revision ID: 7ff47adc1056
+Revises: e1969dc3f619
+Create Date: 2026-10-17 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7ff47adc1056'
+down_revision = 'e1969dc3f619'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'unread_notifications' not in {c['name'] for c in sa.inspect(op.get_bind()).get_columns('user')}:
+        op.add_column('user', sa.Column('unread_notifications', sa.Integer(), nullable=False, server_default='0'))
+    user = sa.table('user', sa.column('id', sa.String), sa.column('unread_notifications', sa.Integer))
+    notification = sa.table('notification', sa.column('id', sa.Integer), sa.column('user_id', sa.String),
+                            sa.column('read', sa.Boolean))
+    unread = (sa.select(sa.func.count(notification.c.id))
+              .where(notification.c.user_id == user.c.id, notification.c.read.isnot(True))
+              .scalar_subquery())
+    op.execute(user.update().values(unread_notifications=unread))
+
+
+def downgrade():
+    op.drop_column('user', 'unread_notifications')
@@ -0,0 +1,32 @@
+"""Add device_token.selector
+
+Legacy bcrypt-hashed tokens keep a NULL selector until their user next
+logs in. Skips what db.create_all() already made.
+
+Revision ID: 92ed9a517518
+Revises: c7d8e9f0a1b2
+Create Date: 2026-10-17 14:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '92ed9a517518'
+down_revision = 'c7d8e9f0a1b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'selector' not in {c['name'] for c in inspector.get_columns('device_token')}:
+        op.add_column('device_token', sa.Column('selector', sa.String(length=32), nullable=True))
+    if 'ix_device_token_selector' not in {i['name'] for i in inspector.get_indexes('device_token')}:
+        op.create_index('ix_device_token_selector', 'device_token', ['selector'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_device_token_selector', table_name='device_token')
+    op.drop_column('device_token', 'selector')
@@ -0,0 +1,25 @@
+"""Index the active job listing for keyset pagination
+
+Revision ID: 9382291392d4
+Revises: d44421d52f2d
+Create Date: 2026-10-17 14:03:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9382291392d4'
+down_revision = 'd44421d52f2d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'ix_job_status_created_at_id' not in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('job')}:
+        op.create_index('ix_job_status_created_at_id', 'job', ['status', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_status_created_at_id', table_name='job')
@@ -0,0 +1,42 @@
+"""Add broadcast and broadcast_cursor
+
+Revision ID: ac1e3a88a5ee
+Revises: f8839b7994e2
+Create Date: 2026-10-17 14:08:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ac1e3a88a5ee'
+down_revision = 'f8839b7994e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    tables = sa.inspect(op.get_bind()).get_table_names()
+    if 'broadcast' not in tables:
+        op.create_table(
+            'broadcast',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('message', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+        op.create_index('ix_broadcast_created_at', 'broadcast', ['created_at'])
+    if 'broadcast_cursor' not in tables:
+        op.create_table(
+            'broadcast_cursor',
+            sa.Column('user_id', sa.String(length=36), sa.ForeignKey('user.id', ondelete='CASCADE'),
+                      primary_key=True),
+            sa.Column('last_broadcast_id', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade():
+    op.drop_table('broadcast_cursor')
+    op.drop_index('ix_broadcast_created_at', table_name='broadcast')
+    op.drop_table('broadcast')
@@ -0,0 +1,28 @@
+"""Baseline schema
+
+The tables up to this point are created by db.create_all() at startup, and
+existing databases may already be stamped with this revision. Later
+revisions alter those tables in place.
+
+Revision ID: c7d8e9f0a1b2
+Revises:
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d8e9f0a1b2'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
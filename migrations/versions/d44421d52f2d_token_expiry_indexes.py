@@ -0,0 +1,31 @@
+"""Index token expiry columns for the reaper
+
+Revision ID: d44421d52f2d
+Revises: 92ed9a517518
+Create Date: 2026-10-17 14:02:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd44421d52f2d'
+down_revision = '92ed9a517518'
+branch_labels = None
+depends_on = None
+
+TABLES = ('device_token', 'token', 'admin_token')
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        name = f'ix_{table}_expires_at'
+        if name not in {i['name'] for i in inspector.get_indexes(table)}:
+            op.create_index(name, table, ['expires_at'])
+
+
+def downgrade():
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_expires_at', table_name=table)
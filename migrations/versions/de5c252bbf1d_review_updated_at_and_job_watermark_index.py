@@ -0,0 +1,33 @@
+"""Add review.updated_at and index job.updated_at
+
+Existing reviews take their created_at as updated_at.
+
+Revision ID: de5c252bbf1d
+Revises: 002ba8c75fb8
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'de5c252bbf1d'
+down_revision = '002ba8c75fb8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if 'updated_at' not in {c['name'] for c in inspector.get_columns('review')}:
+        op.add_column('review', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    review = sa.table('review', sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime))
+    op.execute(review.update().where(review.c.updated_at.is_(None)).values(updated_at=review.c.created_at))
+    if 'ix_job_updated_at' not in {i['name'] for i in inspector.get_indexes('job')}:
+        op.create_index('ix_job_updated_at', 'job', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_job_updated_at', table_name='job')
+    op.drop_column('review', 'updated_at')
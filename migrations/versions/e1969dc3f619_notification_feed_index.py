@@ -0,0 +1,26 @@
+"""Index notifications by user, read flag and age
+
+Revision ID: e1969dc3f619
+Revises: ac1e3a88a5ee
+Create Date: 2026-10-17 14:09:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1969dc3f619'
+down_revision = 'ac1e3a88a5ee'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    indexes = {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('notification')}
+    if 'ix_notification_user_read_created_at' not in indexes:
+        op.create_index('ix_notification_user_read_created_at', 'notification', ['user_id', 'read', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_notification_user_read_created_at', table_name='notification')
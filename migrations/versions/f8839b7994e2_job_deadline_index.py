@@ -0,0 +1,25 @@
+"""Index active jobs by deadline for the expiry sweep
+
+Revision ID: f8839b7994e2
+Revises: 3f5e5bcda272
+Create Date: 2026-10-17 14:07:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8839b7994e2'
+down_revision = '3f5e5bcda272'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'ix_job_status_deadline' not in {i['name'] for i in sa.inspect(op.get_bind()).get_indexes('job')}:
+        op.create_index('ix_job_status_deadline', 'job', ['status', 'deadline'])
+
+
+def downgrade():
+    op.drop_index('ix_job_status_deadline', table_name='job')
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark new-job notification fan-out against growing user counts.
+
+Builds a throwaway SQLite database and, for each user count, times writing
+one notification per user three ways: the old per-user ORM loop, a single
+INSERT ... SELECT and chunked INSERT ... SELECTs. For comparison it also
+times the single-row broadcast new postings now use. Reports wall time and
+peak Python memory for each.
+
+Usage: python scripts/bench_notification_fanout.py [--users 10000 50000 100000] [--chunk-size 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'fanout.db')}"
+os.environ.setdefault('MAIL_SUPPRESS_SEND', 'True')
+
+
+def measure(func):
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return written, elapsed, peak
+
+
+def orm_loop(db, User, Notification, message):
+    users = User.query.filter(User.role != 'admin').all()
+    for user in users:
+        db.session.add(Notification(user_id=user.id, message=message))
+    db.session.commit()
+    return len(users)
+
+
+def insert_select(db, User, Notification, message, chunk_size=0):
+    """The per-user fan-out broadcasts replaced: INSERT ... SELECT, optionally
+    in keyset chunks of user ids committed one at a time."""
+    recipients = User.role != 'admin'
+    columns = ['user_id', 'message', 'read', 'created_at']
+    written, last = 0, None
+    while True:
+        conditions = [recipients] if last is None else [recipients, User.id > last]
+        upper = None
+        if chunk_size:
+            # Upper bound of this chunk: the chunk_size-th recipient after `last`
+            upper = db.session.execute(
+                db.select(User.id).where(*conditions).order_by(User.id).offset(chunk_size - 1).limit(1)
+            ).scalar()
+            if upper is not None:
+                conditions.append(User.id <= upper)
+        rows = db.select(User.id, db.literal(message), db.false(), db.func.now()).where(*conditions)
+        written += db.session.execute(db.insert(Notification).from_select(columns, rows)).rowcount
+        db.session.commit()
+        if upper is None:
+            return written
+        last = upper
+
+
+def broadcast_once(db, broadcast, message):
+    broadcast(message)
+    db.session.commit()
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import User, Notification, Broadcast
+    from app.notifications.broadcasts import broadcast
+    app = create_app()
+    message = 'New job posted: Backend intern at Acme'
+    print(f"{'users':>8} {'method':<22} {'rows':>8} {'seconds':>8} {'peak_mb':>8}")
+    with app.app_context():
+        for count in args.users:
+            db.session.execute(db.delete(User))
+            db.session.execute(db.insert(User), [
+                {'id': str(uuid.uuid4()), 'email': f'user{i}@msrit.edu', 'name': f'User {i}', 'role': 'user',
+                 'is_verified': True}
+                for i in range(count)
+            ])
+            db.session.commit()
+            methods = [
+                ('orm loop (before)', lambda: orm_loop(db, User, Notification, message)),
+                ('insert ... select', lambda: insert_select(db, User, Notification, message)),
+                (f'chunked ({args.chunk_size})', lambda: insert_select(db, User, Notification, message, args.chunk_size)),
+                ('broadcast', lambda: broadcast_once(db, broadcast, message)),
+            ]
+            for label, func in methods:
+                written, elapsed, peak = measure(func)
+                print(f"{count:>8} {label:<22} {written:>8} {elapsed:>8.3f} {peak / 1e6:>8.1f}")
+                db.session.execute(db.delete(Notification))
+                db.session.execute(db.delete(Broadcast))
+                db.session.commit()
+                db.session.expunge_all()
+
+
+if __name__ == '__main__':
+    main()
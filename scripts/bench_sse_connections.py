@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Measure how many idle /notifications/stream connections one worker holds.
+
+Builds a throwaway SQLite database with one logged-in user, starts a single
+worker (waitress in-process, or gunicorn sync/gthread as a subprocess) and
+opens idle SSE connections one at a time. After each one it checks whether
+the stream got its response headers and whether an ordinary GET / is still
+served. It also reports the worker's resident memory per open stream. The
+hub's own SSE_MAX_CONNECTIONS cap is lifted for the run, so it measures
+the server and not the app.
+
+Usage: python scripts/bench_sse_connections.py [--connections 12] [--threads 4 8]
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'sse.db')}"
+os.environ.setdefault('MAIL_SUPPRESS_SEND', 'True')
+os.environ['SECRET_KEY'] = 'bench-sse-connections'
+os.environ['SSE_MAX_CONNECTIONS'] = '100000'
+
+TIMEOUT = 2.0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, seconds=20):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def request(port, path, cookie=None):
+    sock = socket.create_connection(('127.0.0.1', port), timeout=TIMEOUT)
+    headers = f'GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n'
+    if cookie:
+        headers += f'Cookie: {cookie}\r\n'
+    sock.sendall((headers + '\r\n').encode())
+    return sock
+
+
+def status_line(sock):
+    """The response status line, or None if nothing arrived within TIMEOUT."""
+    try:
+        data = sock.recv(256)
+    except socket.timeout:
+        return None
+    return data.split(b'\r\n', 1)[0].decode(errors='replace') or None
+
+
+def probe(port):
+    """Whether GET / is answered while the streams are open."""
+    sock = request(port, '/')
+    try:
+        return status_line(sock) is not None
+    finally:
+        sock.close()
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run(label, port, pid, cookie, connections):
+    wait_for(port)
+    probe(port)  # warm up imports and the session cache
+    baseline = rss_mb(pid)
+    streams, held = [], 0
+    print(f"{label:<22} {'open':>5} {'served':>7} {'GET /':>6} {'rss_mb':>8} {'kb/stream':>10}")
+    for n in range(1, connections + 1):
+        sock = request(port, '/notifications/stream', cookie)
+        streams.append(sock)
+        line = status_line(sock)
+        if line and ' 200 ' in f'{line} ':
+            held += 1
+        answered = probe(port)
+        rss = rss_mb(pid)
+        per_stream = (rss - baseline) * 1024 / held if held else 0.0
+        print(f"{'':<22} {n:>5} {held:>7} {'yes' if answered else 'no':>6} {rss:>8.1f} {per_stream:>10.1f}")
+        if not answered and not line:
+            break
+    for sock in streams:
+        sock.close()
+    return held
+
+
+def waitress_worker(app, cookie, threads, connections):
+    from waitress import create_server
+    port = free_port()
+    server = create_server(app, host='127.0.0.1', port=port, threads=threads)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        return run(f'waitress threads={threads}', port, os.getpid(), cookie, connections)
+    finally:
+        server.close()
+
+
+def gunicorn_worker(cookie, worker_class, threads, connections):
+    port = free_port()
+    command = [sys.executable, '-m', 'gunicorn', '--workers', '1', '--worker-class', worker_class,
+               '--threads', str(threads), '--bind', f'127.0.0.1:{port}', '--log-level', 'warning',
+               'app:create_app()']
+    master = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(port)
+        with open(f'/proc/{master.pid}/task/{master.pid}/children') as children:
+            worker = int(children.read().split()[0])
+        label = f'gunicorn {worker_class}' + (f' threads={threads}' if worker_class == 'gthread' else '')
+        return run(label, port, worker, cookie, connections)
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--connections', type=int, default=12)
+    parser.add_argument('--threads', type=int, nargs='+', default=[4, 8])
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import User
+    from app.utils.auth import issue_device_token, DEVICE_COOKIE
+    app = create_app()
+    app.config['RATELIMIT_ENABLED'] = False
+    app.logger.setLevel(logging.WARNING)
+    with app.app_context():
+        user = User(email='student@msrit.edu', name='Student', is_verified=True)
+        db.session.add(user)
+        db.session.commit()
+        cookie = f'{DEVICE_COOKIE}={issue_device_token(user)}'
+        db.session.commit()
+
+    results = []
+    for threads in args.threads:
+        results.append((f'waitress threads={threads}', waitress_worker(app, cookie, threads, args.connections)))
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print('gunicorn is not installed; skipping it')
+    else:
+        results.append(('gunicorn sync', gunicorn_worker(cookie, 'sync', 1, args.connections)))
+        for threads in args.threads:
+            results.append((f'gunicorn gthread threads={threads}',
+                            gunicorn_worker(cookie, 'gthread', threads, args.connections)))
+    print()
+    for label, held in results:
+        print(f'{label:<30} holds {held} idle streams')
+
+
+if __name__ == '__main__':
+    main()
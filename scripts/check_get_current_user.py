@@ -8,13 +8,10 @@ import secrets
 app=create_app()
 with app.app_context():
     u=User.query.filter_by(email='ui-test@msrit.edu').first()
-    token_plain = secrets.token_urlsafe(40)
-    token_hash = bcrypt.generate_password_hash(token_plain).decode('utf-8')
-    dt = DeviceToken(user_id=u.id, token_hash=token_hash, expires_at=datetime.utcnow()+timedelta(days=7))
-    db.session.add(dt)
+    from app.utils.auth import get_current_user, issue_device_token
+    token_plain = issue_device_token(u)
     db.session.commit()
 
-    from app.utils.auth import get_current_user
     # simulate request with cookie
     with app.test_request_context('/', headers={'Cookie': f'device_token={token_plain}'}):
         cu = get_current_user()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Guard the number of SQL statements behind the job detail views.
+
+Builds a throwaway SQLite database, warms the session cache and then counts
+the statements issued by GET /job/<id> and /application/<id>/details.
+Exits non-zero if either goes over budget.
+
+Usage: python scripts/check_job_detail_queries.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'detail_queries.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+os.environ.setdefault('MAIL_SUPPRESS_SEND', 'True')
+
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models import User, Job, Application, Review
+from app.reviews.ratings import record_rating
+from app.utils.auth import issue_device_token, DEVICE_COOKIE
+
+# conditional-GET validator (1) + job/application/review/rating (1) + reviews page (1)
+# + similar job cards (1)
+JOB_DETAIL_BUDGET = 4
+# application + job + review (1)
+APPLICATION_DETAILS_BUDGET = 1
+
+app = create_app()
+app.config['RATELIMIT_ENABLED'] = False
+
+with app.app_context():
+    owner = User(email='owner@msrit.edu', name='Owner', is_verified=True, role='admin')
+    student = User(email='student@msrit.edu', name='Student', is_verified=True)
+    reviewers = [User(email=f'r{i}@msrit.edu', name=f'Reviewer {i}', is_verified=True) for i in range(25)]
+    db.session.add_all([owner, student] + reviewers)
+    db.session.commit()
+    job = Job(title='Backend intern', description='Flask and SQL', company='Acme', location='Bangalore',
+              apply_url='https://example.com', posted_by=owner.id)
+    db.session.add(job)
+    db.session.commit()
+    for i, reviewer in enumerate(reviewers + [student]):
+        db.session.add(Application(user_id=reviewer.id, job_id=job.id))
+        record_rating(job.id, i % 5 + 1)
+        db.session.add(Review(job_id=job.id, user_id=reviewer.id, rating=i % 5 + 1, comment=f'review {i}'))
+    db.session.commit()
+    application_id = Application.query.filter_by(user_id=student.id).first().id
+    job_id = job.id
+    token = issue_device_token(student)
+    db.session.commit()
+
+statements = []
+with app.app_context():
+    event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+
+def count(client, path):
+    client.get(path)  # warm the session cache
+    del statements[:]
+    response = client.get(path)
+    assert response.status_code == 200, (path, response.status_code)
+    return len(statements)
+
+
+client = app.test_client()
+client.set_cookie(DEVICE_COOKIE, token)
+results = {
+    f'/job/{job_id}': (count(client, f'/job/{job_id}'), JOB_DETAIL_BUDGET),
+    f'/application/{application_id}/details': (count(client, f'/application/{application_id}/details'),
+                                               APPLICATION_DETAILS_BUDGET),
+}
+failed = False
+for path, (used, budget) in results.items():
+    print(f'{path}: {used} statements (budget {budget})')
+    failed = failed or used > budget
+if failed:
+    for sql in statements:
+        print('  ', sql.splitlines()[0][:120])
+    sys.exit(1)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Guard keyset pagination against skipped or repeated rows.
+
+Builds a throwaway SQLite database of jobs whose created_at values share
+seconds and mix the two shapes SQLite stores: whole-second CURRENT_TIMESTAMP
+defaults and Python datetimes, with and without microseconds. It then walks
+GET /jobs page by page at several page sizes, and replays forward with
+keyset_since() from every row. Exits non-zero if any job is missing or
+repeated.
+
+Usage: python scripts/check_keyset_pagination.py
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'keyset.db')}"
+os.environ.setdefault('MAIL_SUPPRESS_SEND', 'True')
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Job
+from app.utils.auth import issue_device_token, DEVICE_COOKIE
+from app.utils.pagination import encode_cursor, keyset_since
+
+JOBS = 25
+PAGE_SIZES = (1, 2, 3, 4, 7)
+
+app = create_app()
+app.config['RATELIMIT_ENABLED'] = False
+
+with app.app_context():
+    user = User(email='student@msrit.edu', name='Student', is_verified=True)
+    db.session.add(user)
+    db.session.commit()
+    base = datetime.utcnow().replace(microsecond=0)
+    for i in range(JOBS):
+        # Every 7th job takes the CURRENT_TIMESTAMP default; every 5th lands on a whole second
+        created = {} if i % 7 == 3 else {
+            'created_at': base + timedelta(seconds=i % 3, microseconds=0 if i % 5 == 0 else 1000 * i)
+        }
+        db.session.add(Job(title=f'Job {i}', description='d', company='Acme', location='Bangalore',
+                           apply_url='https://example.com', posted_by=user.id, **created))
+        db.session.commit()
+    token = issue_device_token(user)
+    db.session.commit()
+    expected = {job.id for job in Job.query}
+    ordered = Job.query.order_by(db.func.strftime('%Y-%m-%d %H:%M:%f', Job.created_at), Job.id).all()
+    replay_errors = []
+    for position, job in enumerate(ordered):
+        newer = keyset_since(Job.query, Job.created_at, Job.id, encode_cursor(job.created_at, job.id), JOBS)
+        if [row.id for row in newer] != [row.id for row in ordered[position + 1:]]:
+            replay_errors.append(job.id)
+
+client = app.test_client()
+client.set_cookie(DEVICE_COOKIE, token)
+failed = bool(replay_errors)
+if replay_errors:
+    print(f'keyset_since: wrong replay after jobs {replay_errors}')
+for size in PAGE_SIZES:
+    seen, url = [], f'/jobs?per_page={size}'
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+        html = response.get_data(as_text=True)
+        seen += [int(job_id) for job_id in re.findall(r'href="/job/(\d+)"', html)]
+        match = re.search(r'href="([^"]*[?&]cursor=[^"]*)"', html)
+        url = match.group(1).replace('&amp;', '&') if match else None
+    missing, repeated = expected - set(seen), len(seen) - len(set(seen))
+    print(f'/jobs per_page={size}: {len(set(seen))}/{len(expected)} jobs, {repeated} repeated')
+    if missing or repeated:
+        print(f'  missing {sorted(missing)}')
+        failed = True
+if failed:
+    sys.exit(1)
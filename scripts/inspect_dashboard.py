@@ -8,11 +8,9 @@ import secrets
 app=create_app()
 with app.app_context():
     u=User.query.filter_by(email='ui-test@msrit.edu').first()
-    token_plain = secrets.token_urlsafe(40)
-    token_hash = bcrypt.generate_password_hash(token_plain).decode('utf-8')
-    dt = DeviceToken(user_id=u.id, token_hash=token_hash, expires_at=datetime.utcnow()+timedelta(days=7))
     from app.extensions import db
-    db.session.add(dt)
+    from app.utils.auth import issue_device_token
+    token_plain = issue_device_token(u)
     db.session.commit()
 with app.test_client() as c:
     c.set_cookie('localhost','device_token', token_plain)
@@ -30,15 +30,9 @@ def run_checks(user_email='ui-test@msrit.edu', password='TestPass123', role=None
     ensure_user(email=user_email, role=role)
     with app.app_context():
         # Ensure device token is present so get_current_user() resolves
-        from app.models import DeviceToken
-        import secrets
-        from datetime import datetime, timedelta
-        from app.extensions import bcrypt
-        token_plain = secrets.token_urlsafe(40)
-        token_hash = bcrypt.generate_password_hash(token_plain).decode('utf-8')
+        from app.utils.auth import issue_device_token
         u = User.query.filter_by(email=user_email).first()
-        dt = DeviceToken(user_id=u.id, token_hash=token_hash, expires_at=datetime.utcnow()+timedelta(days=7))
-        db.session.add(dt)
+        issue_device_token(u)
         db.session.commit()
 
     # Render base template with current_user injected to validate header structure